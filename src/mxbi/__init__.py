@@ -1,8 +1,76 @@
-from mxbi.theater import Theater
-from mxbi.ui.launch_panel import LaunchPanel
+from argparse import ArgumentParser
+from pathlib import Path
+
+from mxbi.path import (
+    AUDIO_BENCHMARK_PATH,
+    AUDIO_GOLDEN_PATH,
+    DATA_DIR_PATH,
+    EXPORT_DIR_PATH,
+    STARTUP_PROFILE_PATH,
+)
+from mxbi.utils.startup_profiler import startup_profiler
+
+
+def _build_parser() -> ArgumentParser:
+    parser = ArgumentParser(prog="mxbi")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="time imports and init phases up to the first task",
+    )
+    parser.add_argument("--startup-report", type=Path, default=STARTUP_PROFILE_PATH)
+    parser.add_argument(
+        "--startup-budget",
+        type=Path,
+        default=None,
+        help="json file mapping phase or module names to a maximum in seconds, "
+        "the process exits with status 1 when one is exceeded",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    export_parser = subparsers.add_parser(
+        "export", help="compact session jsonl files into partitioned parquet files"
+    )
+    export_parser.add_argument("--data-dir", type=Path, default=DATA_DIR_PATH)
+    export_parser.add_argument("--output", type=Path, default=EXPORT_DIR_PATH)
+
+    bench_parser = subparsers.add_parser(
+        "bench-audio",
+        help="time stimulus synthesis and playback through a null sink, "
+        "the process exits with status 1 when an output differs from golden",
+    )
+    bench_parser.add_argument("--output", type=Path, default=AUDIO_BENCHMARK_PATH)
+    bench_parser.add_argument("--golden", type=Path, default=AUDIO_GOLDEN_PATH)
+    bench_parser.add_argument("--update-golden", action="store_true")
+    bench_parser.add_argument("--repeat", type=int, default=5)
+
+    return parser
 
 
 def main() -> None:
+    args = _build_parser().parse_args()
+
+    if args.command == "export":
+        from mxbi.data_export import export_sessions
+
+        export_sessions(args.data_dir, args.output)
+        return
+
+    if args.command == "bench-audio":
+        from mxbi.audio_benchmark import run_audio_benchmark
+
+        if not run_audio_benchmark(
+            args.output, args.golden, args.update_golden, args.repeat
+        ):
+            raise SystemExit(1)
+        return
+
+    if args.profile_startup:
+        startup_profiler.enable(args.startup_report, args.startup_budget)
+
+    from mxbi.theater import Theater
+    from mxbi.ui.launch_panel import LaunchPanel
+
     LaunchPanel()
 
     Theater()
@@ -0,0 +1,281 @@
+import gc
+import hashlib
+import json
+import statistics
+import sys
+import tempfile
+import tracemalloc
+from collections.abc import Callable
+from math import ceil
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+import numpy as np
+from pydantic import BaseModel
+
+from mxbi.models.audio import NullSinkConfig
+from mxbi.path import AUDIO_BENCHMARK_PATH, AUDIO_GOLDEN_PATH
+from mxbi.peripheral.audio_player.controller.mock_controller import MockController
+from mxbi.tasks.GNGSiD.stages.discriminate_stage.discriminate_stage_models import (
+    DiscriminateStageParams,
+    load_config,
+)
+from mxbi.tasks.GNGSiD.tasks.discriminate.discriminate_models import TrialConfig
+from mxbi.tasks.GNGSiD.tasks.discriminate.discriminate_scene import (
+    GNGSiDDiscriminateScene,
+)
+from mxbi.utils.aplayer import (
+    SAMPLE_RATE,
+    APlayer,
+    StimulusSequenceUnit,
+    ToneConfig,
+    check_levels,
+)
+from mxbi.utils.audio_device import NullSinkDevice
+from mxbi.utils.logger import logger
+
+STIMULUS_INTENSITY = 70
+PLAYBACK_TIMEOUT = 30.0  # s of wall time per playback
+
+
+class BenchmarkResult(BaseModel):
+    """Timing of one operation; allocations come from a separate traced run."""
+
+    name: str
+    repeat: int
+    median: float  # s
+    best: float  # s
+    peak_bytes: int  # tracemalloc peak while the operation ran
+    retained_blocks: int  # allocated blocks still alive afterwards
+    sha256: str  # of the produced samples
+
+
+class _BenchTheater:
+    """The part of Theater that APlayer uses."""
+
+    def __init__(self) -> None:
+        self.acontroller = MockController()
+
+
+def _sha256(samples: np.ndarray) -> str:
+    return hashlib.sha256(np.ascontiguousarray(samples).tobytes()).hexdigest()
+
+
+def _measure(
+    name: str,
+    operation: Callable[[], np.ndarray],
+    setup: Callable[[], None],
+    repeat: int,
+) -> BenchmarkResult:
+    durations = []
+    for _ in range(repeat):
+        setup()
+        started_at = perf_counter()
+        operation()
+        durations.append(perf_counter() - started_at)
+
+    setup()
+    gc.collect()
+    tracemalloc.start()
+    blocks = sys.getallocatedblocks()
+    samples = operation()
+    gc.collect()
+    retained_blocks = sys.getallocatedblocks() - blocks
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return BenchmarkResult(
+        name=name,
+        repeat=repeat,
+        median=statistics.median(durations),
+        best=min(durations),
+        peak_bytes=peak_bytes,
+        retained_blocks=retained_blocks,
+        sha256=_sha256(samples),
+    )
+
+
+def _trial_config(
+    params: DiscriminateStageParams, index: int, controller: MockController
+) -> TrialConfig:
+    """The longest stimulus trial of a stimulus config, deterministic."""
+    stimulus = params.stimulus_configs[index]
+    high_master, high_digital = controller.get_amp_value(
+        stimulus.stimulus_freq_high, STIMULUS_INTENSITY
+    )
+    low_master, low_digital = controller.get_amp_value(
+        stimulus.stimulus_freq_low, STIMULUS_INTENSITY
+    )
+    return TrialConfig(
+        level=0,
+        stimulation_size=params.stimulation_size,
+        stimulus_duration=params.max_stimulus_duration,
+        time_out=params.time_out,
+        inter_trial_interval=params.inter_trial_interval,
+        reward_duration=params.reward_duration,
+        reward_delay=params.reward_delay,
+        is_stimulus_trial=True,
+        visual_stimulus_delay=params.visual_stimulus_delay,
+        medium_reward_duration=params.medium_reward_duration,
+        medium_reward_threshold=params.medium_reward_threshold,
+        low_reward_duration=params.low_reward_duration,
+        attention_duration=params.attention_duration,
+        stimulus_freq_low=stimulus.stimulus_freq_low,
+        stimulus_freq_low_duration=stimulus.stimulus_freq_low_duration,
+        stimulus_freq_low_master_amp=low_master,
+        stimulus_freq_low_digital_amp=low_digital,
+        stimulus_freq_high=stimulus.stimulus_freq_high,
+        stimulus_freq_high_duration=stimulus.stimulus_freq_high_duration,
+        stimulus_freq_high_master_amp=high_master,
+        stimulus_freq_high_digital_amp=high_digital,
+        stimulus_interval=params.stimulus_interval,
+        extra_response_time=params.extra_response_time,
+    )
+
+
+def _play(aplayer: APlayer, sink: NullSinkDevice, config: TrialConfig) -> np.ndarray:
+    """Render the trial through the null sink and return what it recorded."""
+    _, stimulus = GNGSiDDiscriminateScene.prepare_stimulus(aplayer, config)
+    first = len(sink.recordings)
+    future = aplayer.play_rendered_stimulus(stimulus)
+
+    deadline = perf_counter() + PLAYBACK_TIMEOUT
+    while not future.done():
+        if perf_counter() > deadline:
+            raise TimeoutError("Playback through the null sink did not finish")
+        sink.pump()
+    if not future.result():
+        raise RuntimeError("Playback through the null sink was stopped")
+    # one recording per part of the stimulus
+    return np.concatenate([np.load(r.npy) for r in sink.recordings[first:]])
+
+
+def _benchmark_config(
+    name: str, config: TrialConfig, aplayer: APlayer, sink: NullSinkDevice, repeat: int
+) -> list[BenchmarkResult]:
+    unit_duration = config.stimulus_freq_high_duration + config.stimulus_interval
+    tones = [
+        ToneConfig(
+            frequency=config.stimulus_freq_high,
+            duration=config.stimulus_freq_high_duration,
+        ),
+        ToneConfig(frequency=0, duration=config.stimulus_interval),
+    ]
+    times = max(ceil(config.stimulus_duration / unit_duration), 1)
+
+    units = [
+        StimulusSequenceUnit(
+            frequency=config.stimulus_freq_high,
+            duration=config.stimulus_freq_high_duration,
+            interval=config.stimulus_interval,
+        ),
+        StimulusSequenceUnit(
+            frequency=config.stimulus_freq_low,
+            duration=config.stimulus_freq_low_duration,
+            interval=config.stimulus_interval,
+        ),
+    ]
+
+    def sequence() -> np.ndarray:
+        generated = aplayer.generate_stimulus_sequence(units, config.stimulus_duration)
+        return np.concatenate([u.stimulus for u in generated if u.stimulus is not None])
+
+    def render() -> np.ndarray:
+        return GNGSiDDiscriminateScene.prepare_stimulus(aplayer, config)[1].samples
+
+    cold = aplayer.clear_caches
+    return [
+        _measure(
+            f"{name}/generate_stimulus",
+            lambda: aplayer.generate_stimulus(tones, times),
+            cold,
+            repeat,
+        ),
+        _measure(f"{name}/generate_stimulus_sequence", sequence, cold, repeat),
+        _measure(f"{name}/render_stimulus_sequence", render, cold, repeat),
+        # warm caches, this times the stream callback and the sink
+        _measure(
+            f"{name}/playback", lambda: _play(aplayer, sink, config), lambda: None, 1
+        ),
+    ]
+
+
+def run_audio_benchmark(
+    output: Path = AUDIO_BENCHMARK_PATH,
+    golden: Path = AUDIO_GOLDEN_PATH,
+    update_golden: bool = False,
+    repeat: int = 5,
+) -> bool:
+    """Benchmark the discriminate stage stimuli, False if they differ from golden.
+
+    Every stimulus config in the discriminate stage config is synthesized cold
+    and played through a null sink, so no sound card is needed. The hash of
+    every produced buffer is compared with the golden file, or written to it
+    when ``update_golden`` is set or the file does not exist yet. Every unit of
+    a rendered stimulus must play at its own calibrated level.
+    """
+    results: list[BenchmarkResult] = []
+    level_errors = 0
+    with tempfile.TemporaryDirectory() as sink_dir:
+        aplayer = APlayer(
+            _BenchTheater(),  # type: ignore[arg-type]
+            sink=NullSinkConfig(output_dir=Path(sink_dir), realtime=False),
+        )
+        sink = aplayer.device
+        assert isinstance(sink, NullSinkDevice)
+
+        controller = MockController()
+        for animal, stage_config in load_config().root.items():
+            params = stage_config.params
+            for index in range(len(params.stimulus_configs)):
+                config = _trial_config(params, index, controller)
+                _, stimulus = GNGSiDDiscriminateScene.prepare_stimulus(aplayer, config)
+                for error in check_levels(stimulus):
+                    logger.error(f"{animal}/{index}: {error}")
+                    level_errors += 1
+                results.extend(
+                    _benchmark_config(
+                        f"{animal}/{index}", config, aplayer, sink, repeat
+                    )
+                )
+        sink.close()
+
+    for result in results:
+        logger.info(
+            f"{result.name}: median {result.median * 1000:.3f} ms, "
+            f"best {result.best * 1000:.3f} ms, "
+            f"peak {result.peak_bytes / 1024:.0f} KiB, "
+            f"{result.retained_blocks} blocks retained"
+        )
+
+    report: dict[str, Any] = {
+        "sample_rate": SAMPLE_RATE,
+        "numpy": np.__version__,
+        "results": [result.model_dump() for result in results],
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+
+    hashes = {result.name: result.sha256 for result in results}
+    if update_golden or not golden.exists():
+        golden.parent.mkdir(parents=True, exist_ok=True)
+        golden.write_text(json.dumps(hashes, indent=2, sort_keys=True) + "\n")
+        logger.info(f"Wrote golden hashes to {golden}")
+        return not level_errors
+
+    expected: dict[str, str] = json.loads(golden.read_text())
+    mismatches = [
+        name
+        for name, sha in hashes.items()
+        if name in expected and expected[name] != sha
+    ]
+    missing = sorted(hashes.keys() - expected.keys())
+    extra = sorted(expected.keys() - hashes.keys())
+    for name in mismatches:
+        logger.error(f"{name} differs from the golden output in {golden}")
+    for name in missing:
+        logger.error(f"{name} has no golden output in {golden}")
+    for name in extra:
+        logger.error(f"{name} in {golden} was not produced")
+    return not (mismatches or missing or extra or level_errors)
@@ -1,23 +1,49 @@
+import atexit
 import json
 import os
+from datetime import datetime
 from pathlib import Path
+from threading import Condition, Lock, Thread
+from time import monotonic
 from typing import Generic, TypeVar
 
 from pydantic import BaseModel, ValidationError
 
+from mxbi.models.animal import AnimalStateSnapshots
 from mxbi.models.session import SessionConfig, SessionOptions
-from mxbi.path import CONFIG_SESSION_PATH, OPTIONS_SESSION_PATH
+from mxbi.path import ANIMAL_STATES_PATH, CONFIG_SESSION_PATH, OPTIONS_SESSION_PATH
 from mxbi.utils.logger import logger
 
 T = TypeVar("T", bound=BaseModel)
 
 
 class Configure(Generic[T]):
-    def __init__(self, config_path: Path, config_class: type[T]) -> None:
+    """Pydantic model persisted as JSON, always replaced atomically on save.
+
+    With ``save_delay`` (s) saves are coalesced and written on a saver thread,
+    ``flush`` writes whatever is still pending. Without it ``save`` is synchronous.
+    """
+
+    def __init__(
+        self,
+        config_path: Path,
+        config_class: type[T],
+        save_delay: float | None = None,
+    ) -> None:
         self._config_path = config_path
         self._config_class = config_class
         self._config = self._load_config()
 
+        self._save_delay = save_delay
+        self._pending: dict | None = None  # snapshot waiting for the saver thread
+        self._deadline = 0.0
+        self._condition = Condition()
+        self._write_lock = Lock()
+        self._saver: Thread | None = None
+
+        if self._save_delay is not None:
+            atexit.register(self.flush)
+
     @property
     def value(self) -> T:
         return self._config
@@ -25,10 +51,7 @@ class Configure(Generic[T]):
     def _create_default_config(self) -> T:
         config = self._config_class()
         try:
-            self._config_path.parent.mkdir(parents=True, exist_ok=True)
-
-            with self._config_path.open("w", encoding="utf-8") as f:
-                json.dump(config.model_dump(), f, indent=4)
+            self._write(config.model_dump(mode="json"))
 
             logger.info(f"Created default configuration file at {self._config_path}")
             return config
@@ -56,29 +79,104 @@ class Configure(Generic[T]):
 
         except (ValidationError, ValueError) as e:
             logger.error(f"Invalid configuration format: {e}")
+            self._quarantine_config()
             return self._create_default_config()
         except Exception as e:
             logger.error(f"Unexpected error while loading configuration: {e}")
             return self._create_default_config()
 
-    def save(self, data: T | None = None) -> None:
+    def _quarantine_config(self) -> None:
+        """Keep an unreadable file for inspection instead of overwriting it."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        corrupt_path = self._config_path.with_name(
+            f"{self._config_path.name}.corrupt-{timestamp}"
+        )
         try:
-            if data is not None:
-                self._config = data
+            self._config_path.replace(corrupt_path)
+            logger.warning(f"Moved invalid configuration file to {corrupt_path}")
+        except OSError as e:
+            logger.error(f"Failed to move invalid configuration file: {e}")
+
+    def _write(self, data: dict) -> None:
+        """Write to a temporary file and rename it over the target atomically."""
+        self._config_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._config_path.with_name(f".{self._config_path.name}.tmp")
 
-            self._config_path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
 
-            with self._config_path.open("w", encoding="utf-8") as f:
-                json.dump(self._config.model_dump(), f, indent=4)
+        os.replace(tmp_path, self._config_path)
 
+    def save(self, data: T | None = None) -> None:
+        if data is not None:
+            self._config = data
+
+        # the snapshot is taken on the caller's thread, which owns the model
+        snapshot = self._config.model_dump(mode="json")
+        if self._save_delay is None:
+            self._save_now(snapshot)
+            return
+
+        with self._condition:
+            if self._pending is None:
+                self._deadline = monotonic() + self._save_delay
+            self._pending = snapshot
+            if self._saver is None:
+                self._saver = Thread(
+                    target=self._saver_loop,
+                    name=f"ConfigureSaver-{self._config_path.name}",
+                    daemon=True,
+                )
+                self._saver.start()
+            self._condition.notify()
+
+    def flush(self) -> None:
+        """Write any pending background save before returning."""
+        self._write_pending()
+
+    def _saver_loop(self) -> None:
+        while True:
+            with self._condition:
+                while self._pending is None:
+                    self._condition.wait()
+                while (
+                    self._pending is not None
+                    and (remaining := self._deadline - monotonic()) > 0
+                ):
+                    self._condition.wait(remaining)
+
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        with self._write_lock:
+            with self._condition:
+                snapshot, self._pending = self._pending, None
+            if snapshot is None:
+                return
+
+            try:
+                self._save_now(snapshot)
+            except OSError:
+                # keep it pending unless a newer save replaced it, retry later
+                with self._condition:
+                    if self._pending is None:
+                        self._pending = snapshot
+                        self._deadline = monotonic() + (self._save_delay or 0.0)
+
+    def _save_now(self, snapshot: dict) -> None:
+        try:
+            self._write(snapshot)
             logger.info(f"Configuration saved to {self._config_path}")
-        except Exception as e:
+        except OSError as e:
             logger.error(f"Failed to save configuration file: {e}")
             raise
 
 
 session_options = Configure(OPTIONS_SESSION_PATH, SessionOptions)
-session_config = Configure(CONFIG_SESSION_PATH, SessionConfig)
+session_config = Configure(CONFIG_SESSION_PATH, SessionConfig, save_delay=0.5)
+animal_states = Configure(ANIMAL_STATES_PATH, AnimalStateSnapshots, save_delay=0.5)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,249 @@
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from mxbi.path import DATA_DIR_PATH, EXPORT_DIR_PATH
+from mxbi.utils.logger import logger
+
+if TYPE_CHECKING:
+    from pandas import DataFrame, Series
+
+MANIFEST_FILENAME = "_manifest.json"
+COMMON_METADATA_FILENAME = "_common_metadata"
+PART_SUFFIX = ".parquet"
+
+# session-wide logs of the Scheduler and DetectionRecorder next to the animal
+# directories, they are not trial data
+STREAM_DIRS = ("scheduler", "detector")
+
+# pyarrow type aliases of the AudioTiming fields, so every part stores
+# audio_timings as the same list of structs, also for trials without sound
+AUDIO_TIMING_FIELDS = {
+    "submitted_at": "double",
+    "requested_onset_at": "double",
+    "first_write_at": "double",
+    "onset_at": "double",
+    "completed_at": "double",
+    "output_latency": "double",
+    "underflows": "int64",
+    "start_frame": "int64",
+    "end_frame": "int64",
+    "completed": "bool",
+}
+
+# Partition keys are encoded in the directory layout (hive style), so they are
+# removed from the per-file columns to avoid clashing on read. Values are the
+# pyarrow type aliases a hive dataset reads them as.
+PARTITION_KEYS = {"date": "int32", "animal": "string", "stage": "string"}
+
+Fingerprint = dict[str, int]
+
+
+class DataExporter:
+    """Compact the jsonl session tree into hive-partitioned parquet files.
+
+    Layout: ``<output>/date=YYYYMMDD/animal=<name>/stage=<STAGE>/session=<id>.parquet``.
+    A manifest keyed by ``YYYYMMDD/<session>`` remembers the size of every source
+    file, so repeated runs only convert sessions that are new or still growing.
+    Parts only hold the columns of their own session, ``_common_metadata``
+    holds the schema unified across all of them.
+    """
+
+    def __init__(
+        self, data_dir: Path = DATA_DIR_PATH, output_dir: Path = EXPORT_DIR_PATH
+    ) -> None:
+        self._data_dir = data_dir
+        self._output_dir = output_dir
+        self._manifest_path = self._output_dir / MANIFEST_FILENAME
+        self._manifest = self._load_manifest()
+
+    def export(self) -> int:
+        """Export new or changed sessions and return how many were converted."""
+        if not self._data_dir.exists():
+            logger.warning(f"Data directory not found at {self._data_dir}")
+            return 0
+
+        exported = 0
+        for session_dir in self._iter_session_dirs():
+            key = f"{session_dir.parent.name}/{session_dir.name}"
+            fingerprint = self._fingerprint(session_dir)
+            if not fingerprint or self._manifest.get(key) == fingerprint:
+                continue
+
+            self._export_session(session_dir)
+            self._manifest[key] = fingerprint
+            self._save_manifest()
+            exported += 1
+
+        if exported or not (self._output_dir / COMMON_METADATA_FILENAME).exists():
+            self._write_common_metadata()
+        logger.info(f"Exported {exported} session(s) to {self._output_dir}")
+        return exported
+
+    def _iter_session_dirs(self) -> list[Path]:
+        return sorted(
+            session_dir
+            for date_dir in self._data_dir.iterdir()
+            if date_dir.is_dir() and date_dir.name.isdigit()
+            for session_dir in date_dir.iterdir()
+            if session_dir.is_dir() and session_dir.name.isdigit()
+        )
+
+    def _trial_logs(self, session_dir: Path) -> list[Path]:
+        """The ``<animal>/<STAGE>.jsonl`` files of a session."""
+        return sorted(
+            jsonl_path
+            for jsonl_path in session_dir.glob("*/*.jsonl")
+            if jsonl_path.parent.name not in STREAM_DIRS
+        )
+
+    def _fingerprint(self, session_dir: Path) -> Fingerprint:
+        return {
+            jsonl_path.relative_to(session_dir).as_posix(): jsonl_path.stat().st_size
+            for jsonl_path in self._trial_logs(session_dir)
+        }
+
+    def _export_session(self, session_dir: Path) -> None:
+        date, session = session_dir.parent.name, session_dir.name
+        for jsonl_path in self._trial_logs(session_dir):
+            animal, stage = jsonl_path.parent.name, jsonl_path.stem
+
+            frame = self._read_jsonl(jsonl_path)
+            if frame is None:
+                continue
+            frame.insert(0, "session", int(session))
+
+            part_dir = (
+                self._output_dir
+                / f"date={date}"
+                / f"animal={animal}"
+                / f"stage={stage}"
+            )
+            part_dir.mkdir(parents=True, exist_ok=True)
+            part_path = part_dir / f"session={session}{PART_SUFFIX}"
+
+            # dot-prefixed so dataset readers skip a half-written part
+            tmp_path = part_path.with_name(f".{part_path.name}.tmp")
+            frame.to_parquet(tmp_path, engine="pyarrow", index=False)
+            tmp_path.replace(part_path)
+
+    def _read_jsonl(self, jsonl_path: Path) -> "DataFrame | None":
+        import pandas as pd
+
+        records: list[dict] = []
+        with open(jsonl_path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    logger.warning(
+                        f"Skipping invalid line {line_number} in {jsonl_path}"
+                    )
+
+        if not records:
+            return None
+
+        touch_events = [record.pop("touch_events", None) for record in records]
+        audio_timings = [record.pop("audio_timings", None) for record in records]
+        frame = pd.json_normalize(records, sep=".")
+
+        if any(events is not None for events in touch_events):
+            frame = frame.join(self._flatten_touch_events(touch_events))
+        if any(timings is not None for timings in audio_timings):
+            frame["audio_timings"] = self._type_audio_timings(audio_timings)
+
+        frame = frame.drop(columns=[key for key in PARTITION_KEYS if key in frame])
+        return frame.convert_dtypes(dtype_backend="pyarrow")
+
+    def _flatten_touch_events(
+        self, touch_events: list[list[dict] | None]
+    ) -> "DataFrame":
+        """Turn each trial's list of touches into typed list columns plus a count."""
+        import pandas as pd
+
+        events = [trial_events or [] for trial_events in touch_events]
+        return pd.DataFrame(
+            {
+                "touch_count": [len(trial_events) for trial_events in events],
+                "touch_events.time": [
+                    [float(e["time"]) for e in trial_events] for trial_events in events
+                ],
+                "touch_events.x": [
+                    [int(e["x"]) for e in trial_events] for trial_events in events
+                ],
+                "touch_events.y": [
+                    [int(e["y"]) for e in trial_events] for trial_events in events
+                ],
+            }
+        )
+
+    def _type_audio_timings(self, audio_timings: list[list[dict] | None]) -> "Series":
+        """Turn each trial's audio timings into a list of AudioTiming structs."""
+        import pandas as pd
+        import pyarrow as pa
+
+        timing_type = pa.list_(
+            pa.struct(
+                [
+                    (name, pa.type_for_alias(alias))
+                    for name, alias in AUDIO_TIMING_FIELDS.items()
+                ]
+            )
+        )
+        values = pa.array(
+            [trial_timings or [] for trial_timings in audio_timings], type=timing_type
+        )
+        return pd.Series(values, dtype=pd.ArrowDtype(timing_type))
+
+    def _write_common_metadata(self) -> None:
+        """Unify the schemas of all parts, widening types that differ."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        part_paths = sorted(self._output_dir.glob(f"*/*/*/*{PART_SUFFIX}"))
+        if not part_paths:
+            return
+
+        # the partition keys too, a dataset read with this schema keeps them
+        partitions = pa.schema(
+            [(key, pa.type_for_alias(alias)) for key, alias in PARTITION_KEYS.items()]
+        )
+        schema = pa.unify_schemas(
+            [*(pq.read_schema(part_path) for part_path in part_paths), partitions],
+            promote_options="permissive",
+        )
+        metadata_path = self._output_dir / COMMON_METADATA_FILENAME
+        tmp_path = metadata_path.with_name(COMMON_METADATA_FILENAME + ".tmp")
+        pq.write_metadata(schema.remove_metadata(), tmp_path)
+        tmp_path.replace(metadata_path)
+
+    def _load_manifest(self) -> dict[str, Fingerprint]:
+        try:
+            return json.loads(self._manifest_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable export manifest: {e}")
+            return {}
+
+    def _save_manifest(self) -> None:
+        self._output_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._manifest_path.with_name(MANIFEST_FILENAME + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f, indent=2, sort_keys=True)
+        tmp_path.replace(self._manifest_path)
+
+
+def export_sessions(
+    data_dir: Path = DATA_DIR_PATH, output_dir: Path = EXPORT_DIR_PATH
+) -> int:
+    try:
+        import pyarrow  # noqa: F401
+    except ModuleNotFoundError as exc:
+        raise SystemExit(
+            "mxbi export requires pyarrow, install it with the 'export' extra"
+        ) from exc
+
+    return DataExporter(data_dir, output_dir).export()
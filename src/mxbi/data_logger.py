@@ -1,17 +1,196 @@
+import atexit
 import json
+import os
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING
+from queue import Empty, Queue
+from threading import Lock, Thread
+from time import monotonic
+from typing import TYPE_CHECKING, TextIO
 
+from mxbi.models.data_logger import DurabilityPolicy
 from mxbi.path import DATA_DIR_PATH
 from mxbi.utils.logger import logger
 
 if TYPE_CHECKING:
+    from mxbi.models.data_logger import DataLoggerConfig
     from mxbi.models.session import SessionState
 
 _now = datetime.now()
 
+# sidecar with the byte offset and record count valid after the last recovery
+INDEX_SUFFIX = ".idx"
+
+
+def _fsync(handle: TextIO) -> None:
+    handle.flush()
+    os.fsync(handle.fileno())
+
+
+class _JsonlWriter:
+    """Background writer that collects jsonl lines and appends them in batches."""
+
+    def __init__(
+        self,
+        flush_interval: float,
+        max_buffered_records: int,
+        durability: DurabilityPolicy,
+    ) -> None:
+        self._flush_interval = max(flush_interval, 0.0)
+        self._max_buffered_records = max(max_buffered_records, 1)
+        self._durability = durability
+
+        self._queue: Queue[tuple[Path, str] | None] = Queue()
+        self._batches: dict[Path, list[str]] = {}
+        self._lock = Lock()
+        self._closed = False
+
+        self._thread = Thread(target=self._worker, name="DataLoggerWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, path: Path, line: str) -> bool:
+        """Queue a line for writing, returns False once the writer has been closed."""
+        with self._lock:
+            if self._closed:
+                return False
+            self._queue.put((path, line))
+            return True
+
+    def close(self) -> None:
+        """Drain every queued record to disk."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+
+        self._thread.join()
+
+    def _worker(self) -> None:
+        pending = 0
+        last_flush = monotonic()
+        running = True
+
+        while running:
+            timeout = self._flush_interval if pending else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except Empty:
+                item = ()
+
+            if item is None:
+                running = False
+            elif item:
+                path, line = item
+                self._batches.setdefault(path, []).append(line)
+                pending += 1
+
+            if pending and (
+                not running
+                or pending >= self._max_buffered_records
+                or monotonic() - last_flush >= self._flush_interval
+            ):
+                self._flush()
+                pending = 0
+                last_flush = monotonic()
+
+    def _flush(self) -> None:
+        """Append every file's batch with one open, write and close."""
+        batches, self._batches = self._batches, {}
+        for path, lines in batches.items():
+            try:
+                with open(path, "a", encoding="utf-8") as f:
+                    f.writelines(lines)
+                    if self._durability == DurabilityPolicy.PER_BATCH:
+                        _fsync(f)
+            except OSError as e:
+                logger.error(f"Failed to write {len(lines)} records to {path}: {e}")
+
+
+# one writer per config, so loggers with different settings do not share one
+_writers: dict["DataLoggerConfig", _JsonlWriter] = {}
+_writers_lock = Lock()
+
+
+def _get_writer(config: "DataLoggerConfig") -> _JsonlWriter | None:
+    # a PER_RECORD record must be on disk when save_jsonl returns, so it is
+    # written and fsynced synchronously
+    if not config.buffered or config.durability == DurabilityPolicy.PER_RECORD:
+        return None
+
+    with _writers_lock:
+        writer = _writers.get(config)
+        if writer is None:
+            writer = _JsonlWriter(
+                config.flush_interval, config.max_buffered_records, config.durability
+            )
+            _writers[config] = writer
+        return writer
+
+
+def _is_json_line(line: bytes) -> bool:
+    try:
+        json.loads(line)
+        return True
+    except ValueError:
+        return False
+
+
+def _load_index(index_path: Path) -> tuple[int, int]:
+    try:
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+        return int(index["offset"]), int(index["records"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return 0, 0
+
+
+def _save_index(index_path: Path, offset: int, records: int) -> None:
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"offset": offset, "records": records}, f)
+        _fsync(f)
+    os.replace(tmp_path, index_path)
+
+
+def _recover_jsonl(jsonl_path: Path) -> None:
+    """Truncate a torn tail and record the committed byte offset in a sidecar index.
+
+    Only recovery writes the index, so it describes the file as recovered and
+    goes stale once the session appends to it. The next recovery checks
+    everything after the recorded offset, which is at most one session.
+    """
+    index_path = jsonl_path.with_name(jsonl_path.name + INDEX_SUFFIX)
+    offset, records = _load_index(index_path)
+
+    size = jsonl_path.stat().st_size
+    if offset > size:
+        offset, records = 0, 0
+    if offset == size and index_path.exists():
+        return
+
+    with open(jsonl_path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+
+    # Everything after the last newline is a torn write, and a power cut can
+    # also leave a newline-terminated line of garbage behind it.
+    lines = data.split(b"\n")
+    committed = len(data) - len(lines.pop())
+    while lines and not _is_json_line(lines[-1]):
+        committed -= len(lines.pop()) + 1
+
+    committed_offset = offset + committed
+    if committed_offset < size:
+        logger.warning(
+            f"Truncating {size - committed_offset} torn bytes from {jsonl_path}"
+        )
+        with open(jsonl_path, "r+b") as f:
+            f.truncate(committed_offset)
+            os.fsync(f.fileno())
+
+    _save_index(index_path, committed_offset, records + len(lines))
+
 
 class DataLogger:
     def __init__(
@@ -23,6 +202,52 @@ class DataLogger:
         self._session_id = self.__session_state.session_id
 
         self._data_dir = self._ensure_data_dir()
+        self._config = self.__session_state.session_config.data_logger
+        self._writer = _get_writer(self._config)
+
+    @staticmethod
+    def close_writers() -> None:
+        """Drain the background writers, later records are written synchronously."""
+        with _writers_lock:
+            writers = list(_writers.values())
+
+        for writer in writers:
+            writer.close()
+
+    @staticmethod
+    def recover(session_dir: Path | None = None) -> None:
+        """Repair the jsonl files of a session, defaults to the most recent one."""
+        if session_dir is None:
+            session_dir = DataLogger._latest_session_dir()
+            if session_dir is None:
+                return
+
+        for jsonl_path in sorted(session_dir.rglob("*.jsonl")):
+            try:
+                _recover_jsonl(jsonl_path)
+            except OSError as e:
+                logger.error(f"Failed to recover {jsonl_path}: {e}")
+
+    @staticmethod
+    def _latest_session_dir() -> Path | None:
+        if not DATA_DIR_PATH.exists():
+            return None
+
+        date_dirs = [
+            child
+            for child in DATA_DIR_PATH.iterdir()
+            if child.is_dir() and child.name.isdigit()
+        ]
+        for date_dir in sorted(date_dirs, key=lambda d: d.name, reverse=True):
+            session_dirs = [
+                child
+                for child in date_dir.iterdir()
+                if child.is_dir() and child.name.isdigit()
+            ]
+            if session_dirs:
+                return max(session_dirs, key=lambda d: int(d.name))
+
+        return None
 
     @staticmethod
     def init_session_id() -> int:
@@ -64,10 +289,15 @@ class DataLogger:
     def save_jsonl(self, data: dict) -> None:
         jsonl_path = self._get_path(".jsonl")
         try:
-            json_line = json.dumps(data, ensure_ascii=False)
+            json_line = json.dumps(data, ensure_ascii=False) + "\n"
+
+            if self._writer is not None and self._writer.submit(jsonl_path, json_line):
+                return
 
             with open(jsonl_path, "a", encoding="utf-8") as f:
-                f.write(json_line + "\n")
+                f.write(json_line)
+                if self._config.durability != DurabilityPolicy.NONE:
+                    _fsync(f)
 
         except TypeError as e:
             logger.error(f"Data is not JSON serializable: {e}")
@@ -96,6 +326,9 @@ class DataLogger:
             raise
 
 
+atexit.register(DataLogger.close_writers)
+
+
 if __name__ == "__main__":
     data = {"key": "value"}
     from datetime import datetime
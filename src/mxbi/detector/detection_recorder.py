@@ -0,0 +1,56 @@
+from typing import TYPE_CHECKING
+
+from mxbi.data_logger import DataLogger
+from mxbi.models.detector import DetectionRecord, DetectionRecordKindEnum
+
+if TYPE_CHECKING:
+    from mxbi.detector.detector import DetectionResult, DetectorEvent
+    from mxbi.models.session import SessionState
+    from mxbi.peripheral.rfid.dorset_lid665v42 import Result
+
+
+class DetectionRecorder:
+    """Write frames, detections and events to detector/detections.jsonl.
+
+    Records go through the buffered DataLogger writer, so recording from the
+    reader thread does not wait for the disk. The log can be re-fed with the
+    replay detector.
+    """
+
+    def __init__(self, session_state: "SessionState") -> None:
+        self._logger = DataLogger(session_state, "detector", "detections")
+
+    def record_frame(self, frame: "Result") -> None:
+        self._save(
+            DetectionRecord(
+                kind=DetectionRecordKindEnum.FRAME,
+                monotonic_ns=frame.monotonic_ns,
+                animal_name=frame.animal_id,
+                transport_latency=frame.transport_latency,
+            )
+        )
+
+    def record_detection(self, result: "DetectionResult") -> None:
+        self._save(
+            DetectionRecord(
+                kind=DetectionRecordKindEnum.DETECTION,
+                monotonic_ns=result.detected_ns,
+                animal_name=result.animal_name,
+                error=result.error,
+            )
+        )
+
+    def record_event(
+        self, event: "DetectorEvent", animal_name: str, emitted_ns: int
+    ) -> None:
+        self._save(
+            DetectionRecord(
+                kind=DetectionRecordKindEnum.EVENT,
+                monotonic_ns=emitted_ns,
+                animal_name=animal_name or None,
+                event=event,
+            )
+        )
+
+    def _save(self, record: DetectionRecord) -> None:
+        self._logger.save_jsonl(record.model_dump(mode="json", exclude_none=True))
@@ -1,10 +1,18 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
 from enum import StrEnum, auto
-from threading import Lock
+from threading import Event, Lock, Thread
+from time import monotonic_ns
+from tkinter import TclError
 from typing import TYPE_CHECKING, Callable
 
+from mxbi.detector.detection_recorder import DetectionRecorder
+from mxbi.models.detector import DetectorEventTiming
+from mxbi.utils.logger import logger
+
 if TYPE_CHECKING:
+    from mxbi.models.detector import PresenceConfig
     from mxbi.theater import Theater
 
 
@@ -26,6 +34,113 @@ class DetectorEvent(StrEnum):
 class DetectionResult:
     animal_name: str | None = None
     error: bool = False
+    # monotonic time of the detection, see mxbi.utils.clock for the wall clock
+    detected_ns: int = field(default_factory=monotonic_ns)
+
+
+PRESENCE_POLL_INTERVAL = 0.1  # s between absence timeout checks
+DISPATCH_INTERVAL = 20  # ms between polls of the event queue on the Tk thread
+DISPATCH_TIMINGS = 256  # most recent event timings kept
+SLOW_HANDLER = 0.1  # s, handlers running longer than this are logged
+# a presence event replaces a queued one that its handler would redo anyway
+COALESCED_EVENTS = {
+    DetectorEvent.ANIMAL_ENTERED,
+    DetectorEvent.ANIMAL_RETUREND,
+    DetectorEvent.ANIMAL_CHANGED,
+}
+# failures a handler can hit while switching scenes, logging or looking up an
+# animal's config; others are bugs and reach Tk's report_callback_exception
+HANDLER_ERRORS = (TclError, OSError, LookupError, ValueError, RuntimeError)
+
+
+@dataclass
+class _QueuedEvent:
+    event: DetectorEvent
+    animal_name: str
+    emitted_ns: int
+    coalesced: int = 0
+
+
+class PresenceTracker:
+    """Debounce raw tag reads into presence changes.
+
+    Reads are counted per tag over ``read_window``. A tag becomes present once
+    it has ``min_reads`` reads in the window, its first one ``min_dwell`` ago,
+    and more reads than the present tag, so a stray read or two tags flickering
+    at the antenna do not change the animal. Readers only report tags they
+    see, so the present tag is reported gone after ``absence_timeout``
+    without reads.
+    """
+
+    def __init__(self, config: "PresenceConfig") -> None:
+        self._window_ns = round(config.read_window * 1e9)
+        self._min_reads = config.min_reads
+        self._min_dwell_ns = round(config.min_dwell * 1e9)
+        self._absence_timeout_ns = round(config.absence_timeout * 1e9)
+
+        self._reads: dict[str, deque[int]] = {}
+        self._present: str | None = None
+        self._last_seen_ns = 0
+
+    def update(self, result: DetectionResult) -> DetectionResult | None:
+        """Feed a raw detection, return it debounced if presence changed."""
+        if result.error or result.animal_name is None:
+            # errors and explicit absence are not debounced
+            self.reset()
+            return result
+
+        now = result.detected_ns
+        animal = result.animal_name
+        self._reads.setdefault(animal, deque()).append(now)
+        self._prune(now)
+
+        if animal == self._present:
+            self._last_seen_ns = now
+            return None
+        if not self._confirmed(animal, now):
+            return None
+
+        self._present = animal
+        self._last_seen_ns = now
+        return DetectionResult(animal, False, now)
+
+    def poll(self, now_ns: int) -> DetectionResult | None:
+        """Return a synthesized absence once the present tag timed out."""
+        if self._present is None:
+            return None
+        if now_ns - self._last_seen_ns < self._absence_timeout_ns:
+            return None
+
+        logger.debug(f"No read of {self._present} for the absence timeout")
+        self._present = None
+        self._prune(now_ns)
+        return DetectionResult(None, False, now_ns)
+
+    def read_rate(self, animal_name: str) -> float:
+        """Reads per second of the tag in the current window."""
+        return len(self._reads.get(animal_name, ())) / (self._window_ns / 1e9)
+
+    def reset(self) -> None:
+        self._reads.clear()
+        self._present = None
+
+    def _prune(self, now_ns: int) -> None:
+        horizon = now_ns - self._window_ns
+        for animal in list(self._reads):
+            reads = self._reads[animal]
+            while reads and reads[0] < horizon:
+                reads.popleft()
+            if not reads:
+                del self._reads[animal]
+
+    def _confirmed(self, animal: str, now_ns: int) -> bool:
+        reads = self._reads[animal]
+        if len(reads) < self._min_reads or now_ns - reads[0] < self._min_dwell_ns:
+            return False
+        if self._present is None:
+            return True
+        present_reads = self._reads.get(self._present, ())
+        return len(reads) > len(present_reads)
 
 
 class AnimalDetectorStateMachine:
@@ -117,7 +232,13 @@ class AnimalDetectorStateMachine:
 
 
 class Detector(ABC):
-    def __init__(self, theater: "Theater", port: str = "", baudrate: int = 0) -> None:
+    def __init__(
+        self,
+        theater: "Theater",
+        port: str = "",
+        baudrate: int = 0,
+        presence: "PresenceConfig | None" = None,
+    ) -> None:
         self._theater = theater
         self._port = port
         self._baudrate = baudrate
@@ -127,13 +248,39 @@ class Detector(ABC):
         self._state_lock = Lock()
         self._state_machine = AnimalDetectorStateMachine(self)
 
+        # without a presence config every detection goes to the state machine
+        self._presence = PresenceTracker(presence) if presence is not None else None
+        self._presence_thread: Thread | None = None
+        self._presence_stop = Event()
+
+        # events are queued by the state machine on any thread and handed to
+        # the callbacks on the Tk thread, so readers never wait for the UI
+        self._event_queue: deque[_QueuedEvent] = deque()
+        self._event_lock = Lock()
+        self._dispatch_job: str | None = None
+        self._timings: deque[DetectorEventTiming] = deque(maxlen=DISPATCH_TIMINGS)
+
+        self._recorder: DetectionRecorder | None = None
+        if theater.session_config.record_detections:
+            self._recorder = DetectionRecorder(theater._session_state)
+
     def start(self) -> None:
         if self._is_running:
             return
 
         self._is_running = True
+        self._dispatch_job = self._theater.root.after(
+            DISPATCH_INTERVAL, self._poll_events
+        )
         self._start_detection()
 
+        if self._presence is not None:
+            self._presence_stop.clear()
+            self._presence_thread = Thread(
+                target=self._poll_presence, name="DetectorPresence", daemon=True
+            )
+            self._presence_thread.start()
+
     def quit(self) -> None:
         if not self._is_running:
             return
@@ -141,6 +288,17 @@ class Detector(ABC):
         self._is_running = False
         self._stop_detection()
 
+        if self._dispatch_job is not None:
+            self._theater.root.after_cancel(self._dispatch_job)
+            self._dispatch_job = None
+        with self._event_lock:
+            self._event_queue.clear()
+
+        self._presence_stop.set()
+        if self._presence_thread is not None:
+            self._presence_thread.join(timeout=1.0)
+            self._presence_thread = None
+
     def register_event(
         self, event: DetectorEvent, callback: Callable[[str], None]
     ) -> None:
@@ -149,24 +307,106 @@ class Detector(ABC):
         self._callbacks[event].append(callback)
 
     def _emit_event(self, event: DetectorEvent, animal_name: str) -> None:
-        if event not in self._callbacks:
-            return
-        for callback in self._callbacks[event]:
-            callback(animal_name)
+        queued = _QueuedEvent(event, animal_name, monotonic_ns())
+        if self._recorder is not None:
+            self._recorder.record_event(event, animal_name, queued.emitted_ns)
+
+        with self._event_lock:
+            last = self._event_queue[-1] if self._event_queue else None
+            if last is not None and (
+                (last.event, last.animal_name) == (event, animal_name)
+                or (event in COALESCED_EVENTS and last.event in COALESCED_EVENTS)
+            ):
+                self._event_queue.pop()
+                queued.coalesced = last.coalesced + 1
+                queued.emitted_ns = last.emitted_ns
+            self._event_queue.append(queued)
+
+    def _poll_events(self) -> None:
+        try:
+            self.dispatch_events()
+        finally:
+            if self._is_running:
+                self._dispatch_job = self._theater.root.after(
+                    DISPATCH_INTERVAL, self._poll_events
+                )
+
+    def dispatch_events(self) -> None:
+        """Run the callbacks of the queued events, on the Tk thread."""
+        with self._event_lock:
+            queued, self._event_queue = self._event_queue, deque()
+
+        while queued:
+            item = queued.popleft()
+            dispatched_ns = monotonic_ns()
+            try:
+                for callback in self._callbacks.get(item.event, []):
+                    try:
+                        callback(item.animal_name)
+                    except HANDLER_ERRORS:
+                        # a failing handler must not drop the rest of the batch
+                        logger.exception(f"{item.event} handler failed")
+            except BaseException:
+                # the rest of the batch is dispatched on the next poll
+                with self._event_lock:
+                    self._event_queue.extendleft(reversed(queued))
+                raise
+
+            timing = DetectorEventTiming(
+                event=item.event,
+                animal_name=item.animal_name,
+                emitted_ns=item.emitted_ns,
+                dispatched_ns=dispatched_ns,
+                handled_ns=monotonic_ns(),
+                coalesced=item.coalesced,
+            )
+            self._timings.append(timing)
+            logger.debug(
+                f"{item.event} {item.animal_name}: queued "
+                f"{timing.queue_delay * 1000:.1f} ms, handled in "
+                f"{timing.handler_duration * 1000:.1f} ms"
+                + (f", {item.coalesced} coalesced" if item.coalesced else "")
+            )
+            if timing.handler_duration > SLOW_HANDLER:
+                logger.warning(
+                    f"{item.event} handlers took "
+                    f"{timing.handler_duration * 1000:.0f} ms"
+                )
 
     def process_detection(self, detection_result: DetectionResult) -> None:
         if not self._is_running:
             return
 
+        if self._recorder is not None:
+            self._recorder.record_detection(detection_result)
+
         with self._state_lock:
+            if self._presence is not None:
+                debounced = self._presence.update(detection_result)
+                if debounced is None:
+                    return
+                detection_result = debounced
             self._state_machine.transition(detection_result)
 
+    def _poll_presence(self) -> None:
+        assert self._presence is not None
+        while not self._presence_stop.wait(PRESENCE_POLL_INTERVAL):
+            with self._state_lock:
+                absence = self._presence.poll(monotonic_ns())
+                if absence is not None and self._is_running:
+                    self._state_machine.transition(absence)
+
     @abstractmethod
     def _start_detection(self) -> None: ...
 
     @abstractmethod
     def _stop_detection(self) -> None: ...
 
+    @property
+    def event_timings(self) -> list[DetectorEventTiming]:
+        """Timings of the most recently dispatched events, oldest first."""
+        return list(self._timings)
+
     @property
     def current_animal(self) -> str | None:
         return self._state_machine.current_animal
@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING
 from mxbi.detector.detector import Detector
 from mxbi.detector.dorset_lid665v42_detector import DorsetLID665v42Detector
 from mxbi.detector.mock_detector import MockDetector
+from mxbi.detector.replay_detector import ReplayDetector
 
 if TYPE_CHECKING:
     from mxbi.theater import Theater
@@ -12,6 +13,7 @@ if TYPE_CHECKING:
 class DetectorEnum(StrEnum):
     MOCK = auto()
     DORSET_LID665V42 = auto()
+    REPLAY = auto()
 
 
 class DetectorFactory:
@@ -20,6 +22,7 @@ class DetectorFactory:
     detectors: dict[DetectorEnum, type[Detector]] = {
         DetectorEnum.MOCK: MockDetector,
         DetectorEnum.DORSET_LID665V42: DorsetLID665v42Detector,
+        DetectorEnum.REPLAY: ReplayDetector,
     }
 
     @classmethod
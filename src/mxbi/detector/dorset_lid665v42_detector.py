@@ -7,7 +7,9 @@ from mxbi.peripheral.rfid.dorset_lid665v42 import DorsetLID665v42, Result
 
 class DorsetLID665v42Detector(Detector):
     def __init__(self, theater, port: str, baudrate: int) -> None:
-        super().__init__(theater, port, baudrate)
+        # the reader only reports tags it sees, absence comes from the tracker
+        presence = theater.session_config.detector_presence
+        super().__init__(theater, port, baudrate, presence)
         self._scanner = DorsetLID665v42(self._port, self._baudrate)
 
         self._reader_thread: Thread | None = None
@@ -37,5 +39,7 @@ class DorsetLID665v42Detector(Detector):
             self._reader_thread = None
 
     def _handle_result(self, result: Result) -> None:
-        detect_result = DetectionResult(result.animal_id, False)
+        if self._recorder is not None:
+            self._recorder.record_frame(result)
+        detect_result = DetectionResult(result.animal_id, False, result.monotonic_ns)
         self.process_detection(detect_result)
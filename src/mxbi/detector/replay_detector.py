@@ -0,0 +1,87 @@
+from pathlib import Path
+from threading import Event, Thread
+from time import monotonic_ns
+
+from mxbi.detector.detector import DetectionResult, Detector
+from mxbi.models.detector import DetectionRecord, DetectionRecordKindEnum
+from mxbi.utils.logger import logger
+
+
+class ReplayDetector(Detector):
+    """Re-feed the detections of a recorded detections.jsonl.
+
+    Detections are replayed on their recorded spacing divided by the replay
+    speed and stamped with the replay clock, so the presence tracker and the
+    state machine run as they did on the recorded day. Debouncing thresholds
+    are scaled by the same speed.
+    """
+
+    def __init__(self, theater, port: str, baudrate: int) -> None:
+        config = theater.session_config.detector_replay
+        if config is None:
+            raise ValueError("The replay detector needs SessionConfig.detector_replay")
+
+        presence = None
+        if config.debounce:
+            presence = theater.session_config.detector_presence.scaled(config.speed)
+        super().__init__(theater, port, baudrate, presence)
+
+        self._speed = config.speed
+        self._detections = self._load(config.log)
+
+        self._replay_thread: Thread | None = None
+        self._stop_replay = Event()
+
+    @staticmethod
+    def _load(log: Path) -> list[DetectionRecord]:
+        detections = []
+        skipped = 0
+        with open(log, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = DetectionRecord.model_validate_json(line)
+                except ValueError:
+                    # a torn tail or a line from an older record format
+                    logger.warning(f"Skipping invalid line {line_number} in {log}")
+                    skipped += 1
+                    continue
+                if record.kind == DetectionRecordKindEnum.DETECTION:
+                    detections.append(record)
+        detections.sort(key=lambda record: record.monotonic_ns)
+
+        if skipped:
+            logger.warning(f"Dropped {skipped} unparsable lines from {log}")
+        logger.info(f"Replaying {len(detections)} detections from {log}")
+        return detections
+
+    def _start_detection(self) -> None:
+        self._stop_replay.clear()
+        self._replay_thread = Thread(
+            target=self._replay, name="DetectorReplay", daemon=True
+        )
+        self._replay_thread.start()
+
+    def _stop_detection(self) -> None:
+        self._stop_replay.set()
+        if self._replay_thread is not None:
+            self._replay_thread.join(timeout=1.0)
+            self._replay_thread = None
+
+    def _replay(self) -> None:
+        if not self._detections:
+            return
+
+        recorded_start = self._detections[0].monotonic_ns
+        replay_start = monotonic_ns()
+        for record in self._detections:
+            due = replay_start + (record.monotonic_ns - recorded_start) / self._speed
+            if self._stop_replay.wait(max(due - monotonic_ns(), 0) / 1e9):
+                return
+
+            self.process_detection(
+                DetectionResult(record.animal_name, record.error, monotonic_ns())
+            )
+
+        logger.info("Detection replay finished")
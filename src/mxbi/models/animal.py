@@ -1,6 +1,7 @@
+from enum import StrEnum, auto
 from typing import TYPE_CHECKING
 
-from pydantic import BaseModel, ConfigDict, Field, computed_field
+from pydantic import BaseModel, ConfigDict, Field, RootModel, computed_field
 
 from mxbi.models.task import TaskEnum
 
@@ -14,23 +15,83 @@ class AnimalConfig(BaseModel):
     level: int = 0
 
 
+class EvaluationModeEnum(StrEnum):
+    CUMULATIVE = auto()
+    WINDOW = auto()
+    EWMA = auto()
+
+
 class ScheduleConditionConfig(BaseModel):
     evaluation_interval: int = 20
     difficulty_increase_threshold: float = 0.8
     difficulty_decrease_threshold: float = 0.45
     next_task: TaskEnum | None = None
 
+    # windowed evaluation config
+    evaluation_mode: EvaluationModeEnum = EvaluationModeEnum.CUMULATIVE
+    window_size: int = 20
+    ewma_alpha: float = 0.1
+
 
 class ScheduleCondition(BaseModel):
     level_count: int = 0
     config: ScheduleConditionConfig
 
 
+class OutcomeWindow(BaseModel):
+    """Fixed-size ring of the latest trial outcomes with an EWMA alongside."""
+
+    size: int = 20
+    alpha: float = 0.1
+    outcomes: list[bool] = Field(default_factory=list)
+    head: int = 0
+    correct: int = 0
+    ewma: float = 0.0
+
+    @property
+    def full(self) -> bool:
+        return len(self.outcomes) >= self.size
+
+    @property
+    def correct_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.correct / len(self.outcomes)
+
+    def configure(self, size: int, alpha: float) -> None:
+        size = max(size, 1)
+        if size != self.size:
+            self.size = size
+            self.clear()
+        self.alpha = alpha
+
+    def clear(self) -> None:
+        self.outcomes.clear()
+        self.head = 0
+        self.correct = 0
+        self.ewma = 0.0
+
+    def push(self, outcome: bool) -> None:
+        if not self.outcomes:
+            self.ewma = float(outcome)
+        else:
+            self.ewma += self.alpha * (outcome - self.ewma)
+
+        if len(self.outcomes) < self.size:
+            self.outcomes.append(outcome)
+        else:
+            self.correct -= self.outcomes[self.head]
+            self.outcomes[self.head] = outcome
+            self.head = (self.head + 1) % self.size
+        self.correct += outcome
+
+
 class AnimalState(AnimalConfig):
     trial_id: int = 0
     current_level_trial_id: int = 0
     correct_trial: int = 0
     condition: "ScheduleCondition | None" = None
+    outcome_window: OutcomeWindow = Field(default_factory=OutcomeWindow)
 
     @computed_field
     @property
@@ -42,12 +103,18 @@ class AnimalState(AnimalConfig):
     def reset(self) -> None:
         self.current_level_trial_id = 0
         self.correct_trial = 0
+        self.outcome_window.clear()
 
     def update(self, feedback: "Feedback") -> None:
         self.trial_id += 1
         self.current_level_trial_id += 1
         if feedback:
             self.correct_trial += 1
+        self.outcome_window.push(bool(feedback))
+
+
+class AnimalStateSnapshots(RootModel):
+    root: dict[str, AnimalState] = Field(default_factory=dict)
 
 
 class AnimalOptions(BaseModel):
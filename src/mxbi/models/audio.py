@@ -0,0 +1,55 @@
+from enum import StrEnum, auto
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from mxbi.path import AUDIO_SINK_DIR_PATH
+
+
+class AudioTiming(BaseModel):
+    """Timing of one play call, wall-clock timestamps in seconds."""
+
+    submitted_at: float
+    requested_onset_at: float | None = None  # set by APlayer.play_at
+    first_write_at: float | None = None
+    onset_at: float | None = None  # estimated time the first sample reached the DAC
+    completed_at: float | None = None
+    output_latency: float | None = None  # s, reported by PortAudio
+    underflows: int = 0
+    start_frame: int | None = None
+    end_frame: int | None = None
+    completed: bool | None = None
+
+
+class AudioDeviceStateEnum(StrEnum):
+    HEALTHY = auto()
+    DEGRADED = auto()  # running, but underflows in the recent window
+    RECOVERING = auto()
+    FAILED = auto()  # reopening keeps failing, still retrying
+
+
+class AudioDeviceHealth(BaseModel):
+    state: AudioDeviceStateEnum = AudioDeviceStateEnum.HEALTHY
+    reopen_count: int = 0
+    underflows: int = 0  # since the device manager started
+    last_error: str | None = None
+    last_error_at: float | None = None  # wall clock
+
+
+class NullSinkConfig(BaseModel):
+    """Render the output stream to files instead of opening a sound card."""
+
+    output_dir: Path = AUDIO_SINK_DIR_PATH
+    # pull buffers at the stream rate; offline callers pump the sink themselves
+    realtime: bool = True
+
+
+class SinkRecording(BaseModel):
+    """One finished playback as written by the null sink."""
+
+    index: int
+    start_frame: int
+    end_frame: int
+    wav: Path
+    npy: Path
+    timing: AudioTiming
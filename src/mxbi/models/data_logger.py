@@ -0,0 +1,21 @@
+from enum import StrEnum, auto
+
+from pydantic import BaseModel, ConfigDict
+
+
+class DurabilityPolicy(StrEnum):
+    NONE = auto()
+    PER_BATCH = auto()
+    PER_RECORD = auto()
+
+
+class DataLoggerConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    # buffered writer config
+    buffered: bool = True
+    flush_interval: float = 1.0  # s
+    max_buffered_records: int = 64
+
+    # fsync policy for jsonl records, PER_RECORD bypasses the buffered writer
+    durability: DurabilityPolicy = DurabilityPolicy.NONE
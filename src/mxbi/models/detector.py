@@ -0,0 +1,78 @@
+from enum import StrEnum, auto
+from pathlib import Path
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+class PresenceConfig(BaseModel):
+    """Debouncing of raw RFID reads into presence, times in seconds."""
+
+    model_config = ConfigDict(frozen=True)
+
+    read_window: float = Field(default=2.0, gt=0)  # reads are counted over this
+    min_reads: int = Field(default=2, ge=1)  # in the window before a tag counts
+    min_dwell: float = Field(default=0.3, ge=0)  # since its first read in the window
+    absence_timeout: float = Field(default=5.0, gt=0)  # without reads before LEFT
+
+    @model_validator(mode="after")
+    def _check_dwell(self) -> "PresenceConfig":
+        if self.min_dwell >= self.read_window:
+            raise ValueError("min_dwell must be shorter than read_window")
+        return self
+
+    def scaled(self, speed: float) -> "PresenceConfig":
+        """The same debouncing on a clock running ``speed`` times faster."""
+        return self.model_copy(
+            update={
+                "read_window": self.read_window / speed,
+                "min_dwell": self.min_dwell / speed,
+                "absence_timeout": self.absence_timeout / speed,
+            }
+        )
+
+
+class ReplayConfig(BaseModel):
+    """Re-feed a recorded detections.jsonl instead of reading a detector."""
+
+    model_config = ConfigDict(frozen=True)
+
+    log: Path
+    speed: float = Field(default=1.0, gt=0)  # 1 is real time
+    # debounce with SessionConfig.detector_presence, off for mock recordings
+    debounce: bool = True
+
+
+class DetectionRecordKindEnum(StrEnum):
+    FRAME = auto()  # raw frame from the reader
+    DETECTION = auto()  # DetectionResult handed to the detector
+    EVENT = auto()  # DetectorEvent emitted by the state machine
+
+
+class DetectionRecord(BaseModel):
+    """One line of detections.jsonl, convert times with SessionState.clock_anchor."""
+
+    kind: DetectionRecordKindEnum
+    monotonic_ns: int
+    animal_name: str | None = None
+    error: bool = False
+    event: str | None = None  # EVENT records
+    transport_latency: float | None = None  # s, FRAME records
+
+
+class DetectorEventTiming(BaseModel):
+    """Timing of one dispatched detector event, monotonic ns."""
+
+    event: str
+    animal_name: str
+    emitted_ns: int  # queued by the state machine
+    dispatched_ns: int  # callbacks started on the Tk thread
+    handled_ns: int  # callbacks returned
+    coalesced: int = 0  # queued events this one replaced
+
+    @property
+    def queue_delay(self) -> float:
+        return (self.dispatched_ns - self.emitted_ns) / 1e9
+
+    @property
+    def handler_duration(self) -> float:
+        return (self.handled_ns - self.dispatched_ns) / 1e9
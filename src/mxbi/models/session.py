@@ -4,8 +4,12 @@ from pydantic import BaseModel, ConfigDict, Field
 
 from mxbi.detector.detector_factory import DetectorEnum
 from mxbi.models.animal import AnimalConfig, AnimalOptions
+from mxbi.models.audio import NullSinkConfig
+from mxbi.models.data_logger import DataLoggerConfig
+from mxbi.models.detector import PresenceConfig, ReplayConfig
 from mxbi.models.reward import RewardEnum
 from mxbi.peripheral.pumps.pump_factory import DEFAULT_PUMP, PumpEnum
+from mxbi.utils.clock import ClockAnchor, session_clock
 from mxbi.utils.detect_platform import PlatformEnum
 
 
@@ -33,13 +37,21 @@ class SessionConfig(BaseModel):
     detector: DetectorEnum = DetectorEnum.MOCK
     detector_port: str | None = None
     detector_baudrate: int | None = None
+    detector_presence: PresenceConfig = Field(default_factory=PresenceConfig)
+    detector_replay: ReplayConfig | None = None  # for DetectorEnum.REPLAY
+    record_detections: bool = True
+    audio_channels: int = Field(default=1, ge=1)
+    audio_sink: NullSinkConfig | None = None
     screen_type: ScreenConfig = Field(default_factory=ScreenConfig)
     animals: dict[str, AnimalConfig] = Field(default_factory=dict)
+    data_logger: DataLoggerConfig = Field(default_factory=DataLoggerConfig)
 
 
 class SessionState(BaseModel):
     session_id: int = 0
     start_time: float = Field(default=0.0, frozen=True)
+    # pairs the wall clock with the monotonic clock detections are stamped on
+    clock_anchor: ClockAnchor = Field(default=session_clock, frozen=True)
     end_time: float = 0.0
 
     session_config: SessionConfig = Field(default_factory=SessionConfig, frozen=True)
@@ -10,6 +10,15 @@ CONFIG_SESSION_PATH = CONFIG_DIR_PATH / CONFIG_SESSION_FILENAME
 OPTIONS_SESSION_FILENAME = "options_session.json"
 OPTIONS_SESSION_PATH = CONFIG_DIR_PATH / OPTIONS_SESSION_FILENAME
 
+ANIMAL_STATES_FILENAME = "animal_states.json"
+ANIMAL_STATES_PATH = CONFIG_DIR_PATH / ANIMAL_STATES_FILENAME
+
 DATA_DIR_PATH = Path("data")
+EXPORT_DIR_PATH = Path("data_export")
+PERFORMANCE_INDEX_PATH = DATA_DIR_PATH / "performance_index.sqlite3"
 
 LOG_PATH = ROOT_DIR_PATH / "log"
+STARTUP_PROFILE_PATH = LOG_PATH / "startup_profile.json"
+AUDIO_SINK_DIR_PATH = LOG_PATH / "audio_sink"
+AUDIO_BENCHMARK_PATH = LOG_PATH / "audio_benchmark.json"
+AUDIO_GOLDEN_PATH = ROOT_DIR_PATH / "benchmarks" / "audio_golden.json"
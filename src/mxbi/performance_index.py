@@ -0,0 +1,240 @@
+import sqlite3
+from datetime import date
+from pathlib import Path
+from threading import Lock
+
+from pydantic import BaseModel
+
+from mxbi.path import PERFORMANCE_INDEX_PATH
+from mxbi.utils.logger import logger
+
+RECENT_WINDOW = 20
+
+_COUNTER_COLUMNS = ("correct", "incorrect", "timeout")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS lifetime (
+    animal TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    rewards INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    incorrect INTEGER NOT NULL DEFAULT 0,
+    timeout INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (animal, stage)
+);
+CREATE TABLE IF NOT EXISTS daily (
+    animal TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    day TEXT NOT NULL,
+    rewards INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    incorrect INTEGER NOT NULL DEFAULT 0,
+    timeout INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (animal, stage, day)
+);
+CREATE TABLE IF NOT EXISTS recent (
+    animal TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    seq INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (animal, stage)
+);
+CREATE TABLE IF NOT EXISTS outcomes (
+    animal TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    PRIMARY KEY (animal, stage, slot)
+);
+"""
+
+
+class PerformanceSummary(BaseModel):
+    rewards: int = 0
+    correct: int = 0
+    incorrect: int = 0
+    timeout: int = 0
+
+
+def _today() -> str:
+    return f"{date.today():%Y%m%d}"
+
+
+class PerformanceIndex:
+    """Per animal/stage counters kept on disk and updated once per trial.
+
+    Lifetime and daily totals are plain counter rows, and the last-N correct
+    rate is served from a fixed-size ring of outcomes with a running sum, so
+    every read and update touches a constant number of rows.
+    """
+
+    def __init__(self, path: Path, window: int = RECENT_WINDOW) -> None:
+        self._path = path
+        self._window = max(window, 1)
+        self._lock = Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is not None:
+            return self._connection
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self._path, check_same_thread=False)
+        # WAL with NORMAL sync does not fsync on every commit, which keeps the
+        # per-trial update cheap on SD cards while staying crash consistent.
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+        self._reset_recent_on_window_change(connection)
+        connection.commit()
+
+        self._connection = connection
+        return connection
+
+    def _reset_recent_on_window_change(self, connection: sqlite3.Connection) -> None:
+        row = connection.execute(
+            "SELECT value FROM meta WHERE key = 'window'"
+        ).fetchone()
+        if row is not None and int(row[0]) == self._window:
+            return
+
+        if row is not None:
+            logger.info(f"Recent window changed to {self._window}, resetting outcomes")
+        connection.execute("DELETE FROM recent")
+        connection.execute("DELETE FROM outcomes")
+        connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('window', ?)",
+            (str(self._window),),
+        )
+
+    def record_trial(
+        self, animal: str, stage: str, result: str, rewards: int = 0
+    ) -> None:
+        """Add one trial outcome; cancelled trials only contribute their rewards."""
+        column = result if result in _COUNTER_COLUMNS else None
+        day = _today()
+
+        with self._lock:
+            connection = self._connect()
+            try:
+                self._increment(
+                    connection, "lifetime", (animal, stage), column, rewards
+                )
+                self._increment(
+                    connection, "daily", (animal, stage, day), column, rewards
+                )
+                if column is not None:
+                    self._push_outcome(connection, animal, stage, column == "correct")
+                connection.commit()
+            except sqlite3.Error as e:
+                connection.rollback()
+                logger.error(f"Failed to update performance index: {e}")
+
+    def _increment(
+        self,
+        connection: sqlite3.Connection,
+        table: str,
+        key: tuple[str, ...],
+        column: str | None,
+        rewards: int,
+    ) -> None:
+        key_columns = ", ".join(("animal", "stage", "day")[: len(key)])
+        counters = [int(name == column) for name in _COUNTER_COLUMNS]
+
+        connection.execute(
+            f"INSERT INTO {table} ({key_columns}, rewards, correct, incorrect, timeout) "
+            f"VALUES ({', '.join('?' for _ in key)}, ?, ?, ?, ?) "
+            f"ON CONFLICT ({key_columns}) DO UPDATE SET "
+            "rewards = rewards + excluded.rewards, "
+            "correct = correct + excluded.correct, "
+            "incorrect = incorrect + excluded.incorrect, "
+            "timeout = timeout + excluded.timeout",
+            (*key, rewards, *counters),
+        )
+
+    def _push_outcome(
+        self, connection: sqlite3.Connection, animal: str, stage: str, correct: bool
+    ) -> None:
+        row = connection.execute(
+            "SELECT seq, correct FROM recent WHERE animal = ? AND stage = ?",
+            (animal, stage),
+        ).fetchone()
+        seq, recent_correct = row if row is not None else (0, 0)
+
+        slot = seq % self._window
+        evicted = connection.execute(
+            "SELECT correct FROM outcomes WHERE animal = ? AND stage = ? AND slot = ?",
+            (animal, stage, slot),
+        ).fetchone()
+        if evicted is not None:
+            recent_correct -= evicted[0]
+        recent_correct += int(correct)
+
+        connection.execute(
+            "INSERT OR REPLACE INTO outcomes (animal, stage, slot, correct) "
+            "VALUES (?, ?, ?, ?)",
+            (animal, stage, slot, int(correct)),
+        )
+        connection.execute(
+            "INSERT OR REPLACE INTO recent (animal, stage, seq, correct) "
+            "VALUES (?, ?, ?, ?)",
+            (animal, stage, seq + 1, recent_correct),
+        )
+
+    def lifetime(self, animal: str, stage: str) -> PerformanceSummary:
+        return self._summary(
+            "SELECT rewards, correct, incorrect, timeout FROM lifetime "
+            "WHERE animal = ? AND stage = ?",
+            (animal, stage),
+        )
+
+    def daily(
+        self, animal: str, stage: str, day: str | None = None
+    ) -> PerformanceSummary:
+        """Totals for ``day`` formatted as YYYYMMDD, defaults to today."""
+        return self._summary(
+            "SELECT rewards, correct, incorrect, timeout FROM daily "
+            "WHERE animal = ? AND stage = ? AND day = ?",
+            (animal, stage, day or _today()),
+        )
+
+    def recent_correct_rate(self, animal: str, stage: str) -> float:
+        """Correct rate over the last ``window`` non-cancelled trials."""
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT seq, correct FROM recent WHERE animal = ? AND stage = ?",
+                    (animal, stage),
+                )
+                .fetchone()
+            )
+
+        if row is None or row[0] == 0:
+            return 0.0
+        seq, recent_correct = row
+        return recent_correct / min(seq, self._window)
+
+    def _summary(self, query: str, params: tuple[str, ...]) -> PerformanceSummary:
+        with self._lock:
+            row = self._connect().execute(query, params).fetchone()
+
+        if row is None:
+            return PerformanceSummary()
+        rewards, correct, incorrect, timeout = row
+        return PerformanceSummary(
+            rewards=rewards, correct=correct, incorrect=incorrect, timeout=timeout
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+performance_index = PerformanceIndex(PERFORMANCE_INDEX_PATH)
@@ -0,0 +1,156 @@
+import atexit
+import os
+import select
+import shutil
+import subprocess
+from threading import Lock
+from time import perf_counter
+
+from mxbi.peripheral.audio_player.controller.config import digital_values, master_values
+from mxbi.utils.logger import logger
+
+MASTER_CARD: str | None = None
+DIGITAL_CARD = "0"
+ACK_TIMEOUT = 1.0  # s to wait for amixer to report the control it set
+CONTROL_HEADER = b"Simple mixer control"
+
+
+class AmixerBatchController:
+    """Amixer controller that keeps long-lived ``amixer -s`` pipes open.
+
+    One batch-mode process is kept per sound card, so a volume change is a
+    single line written to a pipe instead of a process spawn. amixer prints the
+    control once it has set it, and a set returns only after that reply, so a
+    tone started afterwards plays at the new volume. Writes that would set the
+    value already applied are skipped.
+    """
+
+    def __init__(self) -> None:
+        self._pipes: dict[str | None, subprocess.Popen] = {}
+        self._replies: dict[str | None, bytes] = {}  # unread output per card
+        self._values: dict[tuple[str | None, str], str] = {}
+        self._lock = Lock()
+
+        atexit.register(self.close)
+
+    def set_master_volume(self, volume: int) -> None:
+        self._set(MASTER_CARD, "Master", f"{volume}%")
+
+    def set_digital_volume(self, volume: int) -> None:
+        self._set(DIGITAL_CARD, "Digital", f"{volume}")
+
+    def get_amp_value(self, freqency: int, amplitude: float) -> tuple[int, int]:
+        return master_values[freqency], digital_values[amplitude]
+
+    def _set(self, card: str | None, control: str, value: str) -> None:
+        with self._lock:
+            if self._values.get((card, control)) == value:
+                return
+
+            started_at = perf_counter()
+            command = f"sset {control} {value}\n"
+            try:
+                confirmed = self._send(card, command)
+            except (BrokenPipeError, OSError) as e:
+                logger.warning(f"amixer pipe for card {card} failed, restarting: {e}")
+                self._drop_pipe(card)
+                try:
+                    confirmed = self._send(card, command)
+                except (BrokenPipeError, OSError) as e:
+                    logger.error(f"Failed to set {control} to {value}: {e}")
+                    self._drop_pipe(card)
+                    return
+
+            if not confirmed:
+                logger.error(
+                    f"amixer did not confirm {control} {value} within "
+                    f"{ACK_TIMEOUT} s, restarting its pipe"
+                )
+                self._drop_pipe(card)
+                return
+
+            self._values[(card, control)] = value
+            logger.debug(
+                f"Set {control} to {value} in "
+                f"{(perf_counter() - started_at) * 1000:.2f} ms"
+            )
+
+    def _send(self, card: str | None, command: str) -> bool:
+        """Write a command and wait for amixer to confirm it."""
+        pipe = self._pipes.get(card)
+        if pipe is None or pipe.poll() is not None:
+            pipe = self._open_pipe(card)
+
+        assert pipe.stdin is not None
+        pipe.stdin.write(command.encode())
+        pipe.stdin.flush()
+        return self._wait_for_reply(card)
+
+    def _wait_for_reply(self, card: str | None) -> bool:
+        """Read up to the control header amixer prints after a set.
+
+        Lines left over from the previous reply are skipped. Returns False on
+        timeout and raises BrokenPipeError when amixer exits.
+        """
+        pipe = self._pipes[card]
+        assert pipe.stdout is not None
+        fd = pipe.stdout.fileno()
+        buffer = self._replies.get(card, b"")
+        deadline = perf_counter() + ACK_TIMEOUT
+
+        while True:
+            *lines, buffer = buffer.split(b"\n")
+            for index, line in enumerate(lines):
+                if line.startswith(CONTROL_HEADER):
+                    self._replies[card] = b"\n".join([*lines[index + 1 :], buffer])
+                    return True
+
+            remaining = deadline - perf_counter()
+            if remaining <= 0:
+                self._replies[card] = buffer
+                return False
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if ready:
+                data = os.read(fd, 4096)
+                if not data:
+                    raise BrokenPipeError("amixer exited")
+                buffer += data
+
+    def _open_pipe(self, card: str | None) -> subprocess.Popen:
+        args = ["amixer", "-s"]
+        if card is not None:
+            args[1:1] = ["-c", card]
+        # amixer block-buffers a pipe, line buffering hands each reply over
+        if shutil.which("stdbuf") is not None:
+            args[:0] = ["stdbuf", "-oL"]
+
+        pipe = subprocess.Popen(
+            args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._pipes[card] = pipe
+        self._replies[card] = b""
+        return pipe
+
+    def _drop_pipe(self, card: str | None) -> None:
+        pipe = self._pipes.pop(card, None)
+        self._replies.pop(card, None)
+        if pipe is not None:
+            pipe.kill()
+            pipe.wait()
+        # the mixer may have been changed while the pipe was broken
+        for key in [key for key in self._values if key[0] == card]:
+            del self._values[key]
+
+    def close(self) -> None:
+        with self._lock:
+            for pipe in self._pipes.values():
+                if pipe.stdin is not None:
+                    pipe.stdin.close()
+                try:
+                    pipe.wait(timeout=1.0)
+                except subprocess.TimeoutExpired:
+                    pipe.kill()
+            self._pipes.clear()
@@ -1,5 +1,8 @@
 from enum import StrEnum, auto
 
+from mxbi.peripheral.audio_player.controller.amixer_batch_controller import (
+    AmixerBatchController,
+)
 from mxbi.peripheral.audio_player.controller.amixer_controller import AmixerController
 from mxbi.peripheral.audio_player.controller.controller import Controller
 from mxbi.peripheral.audio_player.controller.mock_controller import MockController
@@ -8,6 +11,7 @@ from mxbi.peripheral.audio_player.controller.mock_controller import MockControll
 class AudioControllerEnum(StrEnum):
     MOCK = auto()
     AMIXER = auto()
+    AMIXER_BATCH = auto()
 
 
 DEFAULT_PUMP = AudioControllerEnum.AMIXER
@@ -19,6 +23,7 @@ class AudioControllerFactory:
     pumps: dict[AudioControllerEnum, type[Controller]] = {
         AudioControllerEnum.MOCK: MockController,
         AudioControllerEnum.AMIXER: AmixerController,
+        AudioControllerEnum.AMIXER_BATCH: AmixerBatchController,
     }
 
     @classmethod
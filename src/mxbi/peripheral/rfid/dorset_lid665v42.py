@@ -1,12 +1,19 @@
 from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime
 from enum import StrEnum, auto
 from threading import Lock
+from time import monotonic_ns
 from typing import Callable, Deque
 
 from serial import EIGHTBITS, PARITY_NONE, STOPBITS_ONE, Serial
 
+from mxbi.utils.clock import ClockAnchor, session_clock
+
+
+class ReadModeEnum(StrEnum):
+    BYTE = auto()  # one read(1) per byte
+    BULK = auto()  # read what is waiting and scan it for frame boundaries
+
 
 class ProtocolState(StrEnum):
     WAIT_FOR_START = auto()
@@ -19,6 +26,8 @@ START = b"\x02"
 STOP = b"\x03"
 DLE = b"\x10"
 
+BITS_PER_BYTE = 10  # 8N1: start bit, eight data bits, stop bit
+
 
 @dataclass
 class Frame:
@@ -38,33 +47,43 @@ class FrameData:
 
 @dataclass
 class Result:
-    detect_time: float
+    detect_time: float  # wall clock at the start marker, from the session anchor
     animal_id: str
+    monotonic_ns: int = 0  # read completion of the last byte of the frame
+    transport_latency: float = 0.0  # s the frame spent on the serial line
 
 
 class _LID665v42FrameParser:
     """State machine that understands the Dorset LID665v42 frame structure."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self, baudrate: int | None = None, clock: ClockAnchor = session_clock
+    ) -> None:
         self._state = ProtocolState.WAIT_FOR_START
         self._frame_buffer = bytearray()
-        self._frame_started_at = 0.0
+        self._frame_started_ns = 0
         self._last_error: str = ""
+        self._clock = clock
+        # time one byte takes on the line, 0 when the baudrate is unknown
+        self._byte_ns = round(BITS_PER_BYTE * 1e9 / baudrate) if baudrate else 0
 
     def reset(self) -> None:
         self._state = ProtocolState.WAIT_FOR_START
         self._frame_buffer.clear()
-        self._frame_started_at = 0.0
+        self._frame_started_ns = 0
 
     @property
     def last_error(self) -> str:
         return self._last_error
 
-    def feed(self, byte: bytes) -> Result | None:
+    def feed(self, byte: bytes, received_ns: int | None = None) -> Result | None:
         """Consume a single byte and return a complete frame when available"""
+        if received_ns is None:
+            received_ns = monotonic_ns()
+
         match self._state:
             case ProtocolState.WAIT_FOR_START:
-                self._handle_wait_for_start(byte)
+                self._handle_wait_for_start(byte, received_ns)
                 return None
             case ProtocolState.IN_FRAME:
                 self._handle_in_frame(byte)
@@ -73,15 +92,64 @@ class _LID665v42FrameParser:
                 self._handle_after_escape(byte)
                 return None
             case ProtocolState.AWAIT_TRAILER:
-                return self._handle_trailer(byte)
+                return self._handle_trailer(byte, received_ns)
             case _:
                 self._last_error = f"Unhandled protocol state: {self._state}"
                 self.reset()
                 return None
 
-    def _handle_wait_for_start(self, byte: bytes) -> None:
+    def feed_chunk(self, data: bytes, received_ns: int) -> list[Result]:
+        """Consume a chunk of bytes and return every frame it completes.
+
+        Walks the same states as ``feed`` but jumps between STX and DLE with
+        ``bytes.find`` instead of dispatching per byte. ``received_ns`` is the
+        monotonic read completion of the chunk; earlier bytes are stamped back
+        from it by their time on the line.
+        """
+        results: list[Result] = []
+        byte_ns = self._byte_ns
+        pos = 0
+        end = len(data)
+        while pos < end:
+            match self._state:
+                case ProtocolState.WAIT_FOR_START:
+                    start = data.find(START, pos)
+                    skipped_to = end if start < 0 else start
+                    if skipped_to > pos:
+                        received = data[skipped_to - 1 : skipped_to]
+                        self._last_error = (
+                            f"Expected {START!r} but received {received!r}"
+                        )
+                    if start < 0:
+                        break
+                    self._frame_started_ns = received_ns - (end - 1 - start) * byte_ns
+                    self._frame_buffer.extend(DLE + START)
+                    self._state = ProtocolState.IN_FRAME
+                    pos = start + 1
+                case ProtocolState.IN_FRAME:
+                    escape = data.find(DLE, pos)
+                    if escape < 0:
+                        self._frame_buffer.extend(data[pos:])
+                        break
+                    self._frame_buffer.extend(data[pos : escape + 1])
+                    self._state = ProtocolState.AFTER_ESCAPE
+                    pos = escape + 1
+                case ProtocolState.AFTER_ESCAPE:
+                    self._handle_after_escape(data[pos : pos + 1])
+                    pos += 1
+                case ProtocolState.AWAIT_TRAILER:
+                    result = self._handle_trailer(
+                        data[pos : pos + 1],
+                        received_ns - (end - 1 - pos) * byte_ns,
+                    )
+                    if result is not None:
+                        results.append(result)
+                    pos += 1
+        return results
+
+    def _handle_wait_for_start(self, byte: bytes, received_ns: int) -> None:
         if byte == START:
-            self._frame_started_at = datetime.now().timestamp()
+            self._frame_started_ns = received_ns
             self._frame_buffer.extend(DLE)
             self._frame_buffer.extend(byte)
             self._state = ProtocolState.IN_FRAME
@@ -105,14 +173,14 @@ class _LID665v42FrameParser:
         self._frame_buffer.extend(byte)
         self._state = ProtocolState.IN_FRAME
 
-    def _handle_trailer(self, byte: bytes) -> Result | None:
+    def _handle_trailer(self, byte: bytes, received_ns: int) -> Result | None:
         self._frame_buffer.extend(byte)
-        return self._build_result()
+        return self._build_result(received_ns)
 
-    def _build_result(self) -> Result | None:
+    def _build_result(self, completed_ns: int) -> Result | None:
         try:
             result = self._parse_frame(
-                bytes(self._frame_buffer), self._frame_started_at
+                bytes(self._frame_buffer), self._frame_started_ns, completed_ns
             )
             self._last_error = ""
             return result
@@ -122,7 +190,7 @@ class _LID665v42FrameParser:
         finally:
             self.reset()
 
-    def _parse_frame(self, data: bytes, started_at: float) -> Result:
+    def _parse_frame(self, data: bytes, started_ns: int, completed_ns: int) -> Result:
         if len(data) < 6:
             raise ValueError("Received frame shorter than protocol minimum")
 
@@ -153,28 +221,32 @@ class _LID665v42FrameParser:
         animal_id = frame_data.data.hex()[6:10]
 
         return Result(
-            detect_time=started_at,
+            detect_time=self._clock.to_wall(started_ns),
             animal_id=animal_id,
+            monotonic_ns=completed_ns,
+            transport_latency=len(data) * self._byte_ns / 1e9,
         )
 
     def _unescape_payload(self, payload: bytes) -> bytes:
         """
         Remove DLE-based escaping from a Dorset payload. The transport duplicates any
         byte that follows a DLE inside the frame so we treat the first DLE as an escape
-        indicator and keep only the subsequent byte.
+        indicator and keep only the subsequent byte. Runs between escapes are
+        copied whole, found with ``bytes.find`` like ``feed_chunk``.
         """
         result = bytearray()
-        i = 0
-        while i < len(payload):
-            byte = payload[i]
-            if byte == DLE:
-                i += 1
-                if i >= len(payload):
-                    raise ValueError("Dangling DLE escape in Dorset payload")
-                result.append(payload[i])
-            else:
-                result.append(byte)
-            i += 1
+        pos = 0
+        end = len(payload)
+        while pos < end:
+            escape = payload.find(DLE, pos)
+            if escape < 0:
+                result.extend(payload[pos:])
+                break
+            if escape + 1 >= end:
+                raise ValueError("Dangling DLE escape in Dorset payload")
+            result.extend(payload[pos:escape])
+            result.append(payload[escape + 1])
+            pos = escape + 2
         return bytes(result)
 
 
@@ -185,6 +257,7 @@ class DorsetLID665v42:
         baudrate: int,
         unit: str = "01",
         host: str = "FE",
+        read_mode: ReadModeEnum = ReadModeEnum.BULK,
     ) -> None:
         self._serial = Serial(
             port,
@@ -196,7 +269,9 @@ class DorsetLID665v42:
         )
         self._unit = unit
         self._host = host
-        self._protocol = _LID665v42FrameParser()
+        self._read_mode = read_mode
+        self._baudrate = baudrate
+        self._protocol = _LID665v42FrameParser(baudrate)
         self._rx_queue: Deque[Result] = deque()
         self._callbacks: list[Callable[[Result], None]] = []
         self._callback_lock = Lock()
@@ -205,6 +280,11 @@ class DorsetLID665v42:
     def errno(self) -> str:
         return self._protocol.last_error
 
+    @property
+    def byte_time(self) -> float:
+        """Seconds one byte takes on the serial line at the configured baudrate."""
+        return BITS_PER_BYTE / self._baudrate
+
     def open(self) -> None:
         if not self._serial.is_open:
             self._serial.open()
@@ -215,15 +295,36 @@ class DorsetLID665v42:
 
     def read(self) -> None:
         """Continuously read from the serial port and store parsed frames."""
+        match self._read_mode:
+            case ReadModeEnum.BYTE:
+                self._read_bytes()
+            case ReadModeEnum.BULK:
+                self._read_bulk()
+
+    def _read_bytes(self) -> None:
         while self._serial.is_open:
             byte = self._serial.read(1)
             if not byte:
                 continue
 
-            frame = self._protocol.feed(byte)
+            frame = self._protocol.feed(byte, monotonic_ns())
             if frame is not None:
-                self._rx_queue.append(frame)
-                self._notify_subscribers(frame)
+                self._on_frame(frame)
+
+    def _read_bulk(self) -> None:
+        while self._serial.is_open:
+            # block for the first byte, then take everything already buffered
+            chunk = self._serial.read(self._serial.in_waiting or 1)
+            if not chunk:
+                continue
+
+            received_ns = monotonic_ns()
+            for frame in self._protocol.feed_chunk(chunk, received_ns):
+                self._on_frame(frame)
+
+    def _on_frame(self, frame: Result) -> None:
+        self._rx_queue.append(frame)
+        self._notify_subscribers(frame)
 
     def subscribe(self, callback: Callable[[Result], None]) -> None:
         with self._callback_lock:
@@ -3,16 +3,18 @@ from typing import TYPE_CHECKING
 
 from pydantic import BaseModel
 
-from mxbi.config import session_config
+from mxbi.config import animal_states, session_config
 from mxbi.data_logger import DataLogger
 from mxbi.detector.detector import Detector, DetectorEvent
 from mxbi.detector.detector_factory import DetectorFactory
-from mxbi.models.animal import AnimalState
+from mxbi.models.animal import AnimalConfig, AnimalState, EvaluationModeEnum
 from mxbi.models.scheduler import SchedulerState, ScheduleRunningStateEnum
 from mxbi.models.task import TaskEnum
 from mxbi.tasks.task_protocol import Task
 from mxbi.tasks.task_table import task_table
+from mxbi.tasks.trial_prefetcher import trial_prefetcher
 from mxbi.utils.logger import logger
+from mxbi.utils.startup_profiler import startup_profiler
 
 if TYPE_CHECKING:
     from mxbi.models.task import Feedback
@@ -49,9 +51,7 @@ class Scheduler:
         self._detector: Detector = self._init_detector()
 
         self._animal_states = {
-            animal.name: AnimalState(
-                name=animal.name, task=animal.task, level=animal.level
-            )
+            animal.name: self._restore_animal_state(animal)
             for animal in session_config.value.animals.values()
         }
 
@@ -76,13 +76,14 @@ class Scheduler:
 
     def start(self) -> None:
         self._detector.start()
+        # an animal detected on start is scheduled before the first task
+        self._detector.dispatch_events()
         self._state.running = True
         self._run_scheduler_loop()
 
     def quit(self) -> None:
         for animal_state in self._animal_states.values():
-            animal_state.trial_id = 0
-            animal_state.reset()
+            self._checkpoint_animal_state(animal_state)
 
         session_config.save()
 
@@ -93,6 +94,7 @@ class Scheduler:
 
     def _bind_events(self) -> None:
         self._theater.register_event_quit(self.quit)
+        self._theater.register_event_inter_trial(self._prefetch_next_trial)
         self._theater.root.bind("<n>", self._on_manual_next_task)
         self._theater.root.bind("<m>", self._on_manual_next_level)
 
@@ -144,6 +146,7 @@ class Scheduler:
             ].task = self._state.animal_state.task
 
             session_config.save()
+            self._checkpoint_animal_state(self._state.animal_state)
             self._log_task_switch(self._state.animal_state, previous_task)
             if previous_level != self._state.animal_state.level:
                 self._log_level_change(self._state.animal_state, previous_level)
@@ -176,6 +179,7 @@ class Scheduler:
         previous_task = animal_state.task
 
         self._increase_difficulty(animal_state)
+        self._checkpoint_animal_state(animal_state)
 
         if animal_state.level == previous_level and animal_state.task == previous_task:
             logger.info(
@@ -211,6 +215,7 @@ class Scheduler:
             return
 
         self._state.current_task = self._create_task(animal_state)
+        startup_profiler.finish()
         try:
             feedback = self._state.current_task.start()
             self._handle_task_feedback(animal_state, feedback)
@@ -226,6 +231,7 @@ class Scheduler:
             self._theater._session_state,
             AnimalState(),
         )
+        startup_profiler.finish()
         self._state.current_task.start()
 
     def _create_task(self, animal_state: AnimalState) -> Task:
@@ -233,10 +239,23 @@ class Scheduler:
         task = task_class(self._theater, self._theater._session_state, animal_state)
 
         animal_state.condition = task.condition
+        if task.condition is not None:
+            animal_state.outcome_window.configure(
+                task.condition.config.window_size, task.condition.config.ewma_alpha
+            )
         logger.info(f"condition: {task.condition}")
 
         return task
 
+    def _prefetch_next_trial(self) -> None:
+        animal_state = self._state.animal_state
+        if animal_state is None:
+            return
+
+        # speculative: assumes the animal, task and level stay the same
+        task_class = self._select_task(animal_state.task)
+        trial_prefetcher.prefetch(task_class, self._theater, animal_state)
+
     def _handle_task_feedback(
         self, animal_state: AnimalState, feedback: "Feedback"
     ) -> None:
@@ -245,10 +264,39 @@ class Scheduler:
 
         animal_state.update(feedback)
         self._evaluate_and_adjust_difficulty(animal_state)
+        self._checkpoint_animal_state(animal_state)
 
     def _get_animal_state(self, animal_name: str) -> AnimalState:
         return self._animal_states[animal_name]
 
+    def _restore_animal_state(self, animal: AnimalConfig) -> AnimalState:
+        """Resume from the last checkpoint unless the task or level was changed."""
+        snapshot = animal_states.value.root.get(animal.name)
+        if snapshot is None:
+            return AnimalState(name=animal.name, task=animal.task, level=animal.level)
+
+        if snapshot.task != animal.task or snapshot.level != animal.level:
+            logger.info(
+                f"Discarding checkpoint of {animal.name}: "
+                f"{snapshot.task}/{snapshot.level} -> {animal.task}/{animal.level}"
+            )
+            return AnimalState(name=animal.name, task=animal.task, level=animal.level)
+
+        logger.info(
+            f"Restored {animal.name} at trial {snapshot.trial_id}, "
+            f"{snapshot.current_level_trial_id} trials into level {snapshot.level}"
+        )
+        return snapshot.model_copy(update={"condition": None})
+
+    def _checkpoint_animal_state(self, animal_state: AnimalState) -> None:
+        animal_states.value.root[animal_state.name] = animal_state.model_copy(
+            update={"condition": None}, deep=True
+        )
+        try:
+            animal_states.save()
+        except (OSError, ValueError):
+            logger.exception("Failed to checkpoint animal state")
+
     def _select_task(self, task_enum: TaskEnum) -> type[Task]:
         return task_table[task_enum]
 
@@ -256,14 +304,32 @@ class Scheduler:
         if state.condition is None:
             return
 
-        if state.current_level_trial_id < state.condition.config.evaluation_interval:
+        correct_rate = self._evaluation_rate(state)
+        if correct_rate is None:
             return
 
-        if state.correct_rate >= state.condition.config.difficulty_increase_threshold:
+        if correct_rate >= state.condition.config.difficulty_increase_threshold:
             self._increase_difficulty(state)
-        elif state.correct_rate <= state.condition.config.difficulty_decrease_threshold:
+        elif correct_rate <= state.condition.config.difficulty_decrease_threshold:
             self._decrease_difficulty(state)
 
+    def _evaluation_rate(self, state: AnimalState) -> float | None:
+        """Return the rate to evaluate, or None while not enough trials are in."""
+        assert state.condition is not None
+        config = state.condition.config
+
+        match config.evaluation_mode:
+            case EvaluationModeEnum.WINDOW:
+                window = state.outcome_window
+                return window.correct_rate if window.full else None
+            case EvaluationModeEnum.EWMA:
+                window = state.outcome_window
+                return window.ewma if window.full else None
+            case _:
+                if state.current_level_trial_id < config.evaluation_interval:
+                    return None
+                return state.correct_rate
+
     def _increase_difficulty(self, state: AnimalState) -> None:
         if state.condition is None:
             return
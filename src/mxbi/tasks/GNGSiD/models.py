@@ -3,6 +3,8 @@ from typing import TypeAlias
 
 from pydantic import BaseModel, ConfigDict
 
+from mxbi.models.audio import AudioTiming
+
 LevelID: TypeAlias = int
 MonkeyName: TypeAlias = str
 
@@ -50,6 +52,7 @@ class BaseTrialData(BaseModel):
     result: Result
     correct_rate: float
     touch_events: list[TouchEvent]
+    audio_timings: list[AudioTiming] = []
 
 
 class BaseDataToShow(BaseModel):
@@ -61,6 +64,7 @@ class BaseDataToShow(BaseModel):
     correct: int
     incorrect: int
     timeout: int
+    recent: float
 
 
 class PersistentData(BaseModel):
@@ -68,3 +72,4 @@ class PersistentData(BaseModel):
     correct: int
     incorrect: int
     timeout: int
+    recent_correct_rate: float = 0.0
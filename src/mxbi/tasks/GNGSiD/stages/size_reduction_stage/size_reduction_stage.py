@@ -3,13 +3,15 @@ from typing import TYPE_CHECKING, Final
 
 from mxbi.data_logger import DataLogger
 from mxbi.models.animal import ScheduleCondition
+from mxbi.performance_index import performance_index
 from mxbi.tasks.GNGSiD.models import PersistentData, Result
 from mxbi.tasks.GNGSiD.stages.size_reduction_stage.size_reduction_models import (
     SizeReductionStageConfig,
-    config,
+    load_config,
 )
 from mxbi.tasks.GNGSiD.tasks.touch.touch_models import TrialConfig
 from mxbi.tasks.GNGSiD.tasks.touch.touch_scene import GNGSiDTouchScene
+from mxbi.tasks.trial_prefetcher import trial_prefetcher
 from mxbi.utils.logger import logger
 
 if TYPE_CHECKING:
@@ -19,9 +21,6 @@ if TYPE_CHECKING:
     from mxbi.theater import Theater
 
 
-_presistent_data: dict[str, PersistentData] = {}
-
-
 class SizeReductionStage:
     STAGE_NAME: Final[str] = "GNGSiD_SIZE_REDUCTION_STAGE"
 
@@ -37,11 +36,37 @@ class SizeReductionStage:
 
         self._stage_config = self._load_stage_config(animal_state.name)
 
-        _fixed_config = self._stage_config.params
-        _levels_config = self._stage_config.levels_table[animal_state.level]
+        _config = trial_prefetcher.take(type(self), animal_state)
+        if _config is None:
+            _config = self.prepare_trial(theater, animal_state)
 
-        master_amp, digital_amp = self._prepare_stimulus_intensity(
-            self._animal_state.name, _fixed_config.stimulus_freq
+        self._data_logger = DataLogger(
+            self._session_state, self._animal_state.name, self.STAGE_NAME
+        )
+
+        self._presistent_data = self._load_persistent_data()
+        self._rewards_before_trial = self._presistent_data.rewards
+
+        self._task = GNGSiDTouchScene(
+            theater,
+            session_state.session_config,
+            animal_state,
+            session_state.session_config.screen_type,
+            _config,
+            self._presistent_data,
+        )
+
+    @classmethod
+    def prepare_trial(
+        cls, theater: "Theater", animal_state: "AnimalState"
+    ) -> TrialConfig:
+        """Draw the next trial config and render its audio into the caches."""
+        _stage_config = cls._load_stage_config(animal_state.name)
+        _fixed_config = _stage_config.params
+        _levels_config = _stage_config.levels_table[animal_state.level]
+
+        master_amp, digital_amp = cls._prepare_stimulus_intensity(
+            theater, animal_state.name, _fixed_config.stimulus_freq
         )
 
         _config = TrialConfig(
@@ -59,35 +84,21 @@ class SizeReductionStage:
             stimulus_interval=_fixed_config.stimulus_interval,
         )
 
-        self._data_logger = DataLogger(
-            self._session_state, self._animal_state.name, self.STAGE_NAME
-        )
-
-        self._presistent_data = _presistent_data.get(self._animal_state.name)
-
-        if self._presistent_data is None:
-            self._presistent_data = PersistentData(
-                rewards=0,
-                correct=0,
-                incorrect=0,
-                timeout=0,
-            )
-            _presistent_data[self._animal_state.name] = self._presistent_data
-
-        self._task = GNGSiDTouchScene(
-            theater,
-            session_state.session_config,
-            animal_state,
-            session_state.session_config.screen_type,
-            _config,
-            self._presistent_data,
-        )
+        GNGSiDTouchScene.prepare_stimulus(theater.aplayer, _config)
+        return _config
 
     def start(self) -> "Feedback":
         trial_data = self._task.start()
+        trial_data.audio_timings = self._theater.aplayer.take_timings()
         self._data_logger.save_jsonl(trial_data.model_dump())
 
         feedback = self._handle_result(trial_data.result)
+        performance_index.record_trial(
+            self._animal_state.name,
+            self.STAGE_NAME,
+            trial_data.result,
+            rewards=self._presistent_data.rewards - self._rewards_before_trial,
+        )
         logger.debug(
             f"{self.STAGE_NAME}: "
             f"session_id={self._session_state.session_id}, "
@@ -100,23 +111,34 @@ class SizeReductionStage:
 
         return feedback
 
-    def _load_stage_config(self, monkey: str) -> SizeReductionStageConfig:
+    @staticmethod
+    def _load_stage_config(monkey: str) -> SizeReductionStageConfig:
+        config = load_config()
         stage_config = config.root.get(monkey) or config.root.get("default")
         if stage_config is None:
             raise ValueError("No default stage config found")
         return stage_config
 
+    def _load_persistent_data(self) -> PersistentData:
+        daily = performance_index.daily(self._animal_state.name, self.STAGE_NAME)
+        return PersistentData(
+            **daily.model_dump(),
+            recent_correct_rate=performance_index.recent_correct_rate(
+                self._animal_state.name, self.STAGE_NAME
+            ),
+        )
+
     def _handle_result(self, result: "Result") -> "Feedback":
         feedback = False
         match result:
             case Result.CORRECT:
-                _presistent_data[self._animal_state.name].correct += 1
+                self._presistent_data.correct += 1
                 feedback = True
             case Result.INCORRECT:
-                _presistent_data[self._animal_state.name].incorrect += 1
+                self._presistent_data.incorrect += 1
                 feedback = False
             case Result.TIMEOUT:
-                _presistent_data[self._animal_state.name].timeout += 1
+                self._presistent_data.timeout += 1
                 feedback = False
             case Result.CANCEL:
                 feedback = False
@@ -136,11 +158,12 @@ class SizeReductionStage:
     def condition(self) -> "ScheduleCondition | None":
         return self._stage_config.condition
 
-    def _prepare_stimulus_intensity(self, monkey: str, frequency: int):
+    @staticmethod
+    def _prepare_stimulus_intensity(theater: "Theater", monkey: str, frequency: int):
         bt = choice(([[10, 30], [50, 70]])) if monkey == "wolfgang" else []
         at = [80, 80, 80] if monkey == "wolfgang" else [80, 80, 80]
         intensity_options = at * 10 + bt
 
         stimulus_intensity = choice(intensity_options)
 
-        return self._theater.acontroller.get_amp_value(frequency, stimulus_intensity)
+        return theater.acontroller.get_amp_value(frequency, stimulus_intensity)
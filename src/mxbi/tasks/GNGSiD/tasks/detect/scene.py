@@ -20,6 +20,7 @@ if TYPE_CHECKING:
     from mxbi.models.session import ScreenConfig, SessionConfig
     from mxbi.tasks.GNGSiD.models import PersistentData
     from mxbi.theater import Theater
+    from mxbi.utils.aplayer import APlayer
 
 
 class GNGSiDDetectScene:
@@ -38,7 +39,9 @@ class GNGSiDDetectScene:
         self._trial_config: "Final[TrialConfig]" = trial_config
         self._persistent_data: Final["PersistentData"] = persistent_data
 
-        self._tone: Final[NDArray[int16]] = self._prepare_stimulus()
+        self._tone: Final[NDArray[int16]] = self.prepare_stimulus(
+            theater.aplayer, trial_config
+        )
 
         self._set_stimulus_intensity()
 
@@ -66,6 +69,7 @@ class GNGSiDDetectScene:
         self._background.after(
             self._trial_config.inter_trial_interval, self._on_trial_end
         )
+        self._theater.inter_trial()
 
     def _on_trial_end(self) -> None:
         self._background.destroy()
@@ -101,6 +105,7 @@ class GNGSiDDetectScene:
             correct=self._animal_state.correct_trial,
             incorrect=self._persistent_data.incorrect,
             timeout=self._persistent_data.timeout,
+            recent=round(self._persistent_data.recent_correct_rate, 2),
             stimulus=self._trial_config.go,
         )
         self._show_data_widget.show_data(data.model_dump())
@@ -212,21 +217,22 @@ class GNGSiDDetectScene:
     # endregion
 
     # region stimulus and reward
-    def _prepare_stimulus(self) -> "NDArray[int16]":
-        cycle = (
-            self._trial_config.stimulus_freq_duration
-            + self._trial_config.stimulus_interval
-        )
-        repeat = ceil(self._trial_config.stimulus_duration / cycle)
+    @staticmethod
+    def prepare_stimulus(
+        aplayer: "APlayer", trial_config: "TrialConfig"
+    ) -> "NDArray[int16]":
+        """Build the stimulus buffer, safe to call off the Tk thread."""
+        cycle = trial_config.stimulus_freq_duration + trial_config.stimulus_interval
+        repeat = ceil(trial_config.stimulus_duration / cycle)
         repeat = max(repeat, 1)
 
         freq_1 = ToneConfig(
-            frequency=self._trial_config.stimulus_freq,
-            duration=self._trial_config.stimulus_freq_duration,
+            frequency=trial_config.stimulus_freq,
+            duration=trial_config.stimulus_freq_duration,
         )
-        freq_2 = ToneConfig(frequency=0, duration=self._trial_config.stimulus_interval)
+        freq_2 = ToneConfig(frequency=0, duration=trial_config.stimulus_interval)
 
-        return self._theater.aplayer.generate_stimulus([freq_1, freq_2], repeat)
+        return aplayer.generate_stimulus([freq_1, freq_2], repeat)
 
     def _give_stimulus(self, tone: "NDArray[int16]") -> "Future[bool]":
         return self._theater.aplayer.play_stimulus(tone)
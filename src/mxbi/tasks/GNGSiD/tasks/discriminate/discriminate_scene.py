@@ -1,5 +1,6 @@
 from concurrent.futures import Future
 from datetime import datetime
+from time import monotonic
 from tkinter import CENTER, Canvas, Event
 from typing import TYPE_CHECKING, Final
 
@@ -10,7 +11,13 @@ from mxbi.tasks.GNGSiD.tasks.discriminate.discriminate_models import (
     TrialData,
 )
 from mxbi.tasks.GNGSiD.tasks.utils.targets import DiscriminateTarget
-from mxbi.utils.aplayer import StimulusSequenceUnit
+from mxbi.utils.aplayer import (
+    SAMPLE_RATE,
+    APlayer,
+    RenderedStimulus,
+    StimulusSequenceUnit,
+    loudest_volume,
+)
 from mxbi.utils.tkinter.components.canvas_with_border import CanvasWithInnerBorder
 from mxbi.utils.tkinter.components.showdata_widget import ShowDataWidget
 
@@ -21,6 +28,9 @@ if TYPE_CHECKING:
     from mxbi.theater import Theater
 
 
+STIMULUS_LEAD = 0.05  # s, headroom for the volume change and output latency
+
+
 class GNGSiDDiscriminateScene:
     def __init__(
         self,
@@ -39,29 +49,9 @@ class GNGSiDDiscriminateScene:
         self._trial_config: Final[TrialConfig] = trial_config
         self._persistent_data: Final["PersistentData"] = persistent_data
 
-        # Build stimulus units for attention, high, and low tones
-        attention_unit = self._build_stimulus_unit(
-            frequency=trial_config.stimulus_freq_low,
-            duration=trial_config.stimulus_freq_low_duration,
-            master_volume=trial_config.stimulus_freq_low_master_amp,
-            digital_volume=trial_config.stimulus_freq_low_digital_amp,
-        )
-        high_unit = self._build_stimulus_unit(
-            frequency=trial_config.stimulus_freq_high,
-            duration=trial_config.stimulus_freq_high_duration,
-            master_volume=trial_config.stimulus_freq_high_master_amp,
-            digital_volume=trial_config.stimulus_freq_high_digital_amp,
-        )
-        low_unit = self._build_stimulus_unit(
-            frequency=trial_config.stimulus_freq_low,
-            duration=trial_config.stimulus_freq_low_duration,
-            master_volume=trial_config.stimulus_freq_low_master_amp,
-            digital_volume=trial_config.stimulus_freq_low_digital_amp,
-        )
-
         # Pre-compute the stimuli sequences and timing values used in the trial
-        self._attention_stimulus = self._prepare_stimulus(
-            [attention_unit], trial_config.attention_duration
+        self._attention_stimulus, self._stimulus = self.prepare_stimulus(
+            theater.aplayer, trial_config
         )
 
         # Calculate total response duration including stimulus duration and extra response time
@@ -72,14 +62,6 @@ class GNGSiDDiscriminateScene:
 
         self._reward_duration = self._trial_config.reward_duration
 
-        if trial_config.is_stimulus_trial:
-            stimulus_units = [high_unit, low_unit]
-        else:
-            stimulus_units = [attention_unit]
-        self._stimulus = self._prepare_stimulus(
-            stimulus_units, self._trial_config.stimulus_duration
-        )
-
         self._on_trial_start()
 
     # region public api
@@ -104,6 +86,7 @@ class GNGSiDDiscriminateScene:
         self._background.after(
             self._trial_config.inter_trial_interval, self._on_trial_end
         )
+        self._theater.inter_trial()
 
     def _on_trial_end(self) -> None:
         self._background.destroy()
@@ -140,6 +123,7 @@ class GNGSiDDiscriminateScene:
             correct=self._animal_state.correct_trial,
             incorrect=self._persistent_data.incorrect,
             timeout=self._persistent_data.timeout,
+            recent=round(self._persistent_data.recent_correct_rate, 2),
             stimulus=self._trial_config.is_stimulus_trial,
         )
         self._show_data_widget.show_data(data.model_dump())
@@ -189,13 +173,20 @@ class GNGSiDDiscriminateScene:
     def _on_first_touched(self, event: Event) -> None:
         self._trigger_canvas.destroy()
         self._record_touch(event)
-        future = self._give_stimulus(self._attention_stimulus)
+
+        # schedule both buffers on the audio clock so the gap does not depend on
+        # Tk or thread wake-up jitter
+        attention_onset = monotonic() + STIMULUS_LEAD
+        stimulus_onset = (
+            attention_onset + len(self._attention_stimulus.samples) / SAMPLE_RATE
+        )
+        self._give_stimulus(self._attention_stimulus, attention_onset)
+        future = self._give_stimulus(self._stimulus, stimulus_onset)
         future.add_done_callback(self._start_stimulus_stage)
 
-    def _start_stimulus_stage(self, future: Future) -> None:
-        if not future.result():
+    def _start_stimulus_stage(self, future: "Future[float | None]") -> None:
+        if future.result() is None:
             return
-        self._give_stimulus(self._stimulus)
         self._background.after(0, self._prepare_second_stage)
 
     def _prepare_second_stage(self) -> None:
@@ -254,42 +245,71 @@ class GNGSiDDiscriminateScene:
     # endregion
 
     # region stimulus and reward
+    @classmethod
+    def prepare_stimulus(
+        cls, aplayer: "APlayer", trial_config: "TrialConfig"
+    ) -> tuple[RenderedStimulus, RenderedStimulus]:
+        """Render the attention and stimulus buffers, safe off the Tk thread."""
+        # Build stimulus units for attention, high, and low tones
+        attention_unit = cls._build_stimulus_unit(
+            frequency=trial_config.stimulus_freq_low,
+            duration=trial_config.stimulus_freq_low_duration,
+            interval=trial_config.stimulus_interval,
+            master_volume=trial_config.stimulus_freq_low_master_amp,
+            digital_volume=trial_config.stimulus_freq_low_digital_amp,
+        )
+        high_unit = cls._build_stimulus_unit(
+            frequency=trial_config.stimulus_freq_high,
+            duration=trial_config.stimulus_freq_high_duration,
+            interval=trial_config.stimulus_interval,
+            master_volume=trial_config.stimulus_freq_high_master_amp,
+            digital_volume=trial_config.stimulus_freq_high_digital_amp,
+        )
+        low_unit = cls._build_stimulus_unit(
+            frequency=trial_config.stimulus_freq_low,
+            duration=trial_config.stimulus_freq_low_duration,
+            interval=trial_config.stimulus_interval,
+            master_volume=trial_config.stimulus_freq_low_master_amp,
+            digital_volume=trial_config.stimulus_freq_low_digital_amp,
+        )
+
+        # Share one hardware volume so buffers with its Master value play back to back
+        volume = loudest_volume([attention_unit, high_unit, low_unit])
+
+        if trial_config.is_stimulus_trial:
+            stimulus_units = [high_unit, low_unit]
+        else:
+            stimulus_units = [attention_unit]
+
+        attention = aplayer.render_stimulus_sequence(
+            [attention_unit], trial_config.attention_duration, volume
+        )
+        stimulus = aplayer.render_stimulus_sequence(
+            stimulus_units, trial_config.stimulus_duration, volume
+        )
+        return attention, stimulus
+
+    @staticmethod
     def _build_stimulus_unit(
-        self,
         *,
         frequency: int,
         duration: int,
+        interval: int,
         master_volume: int,
         digital_volume: int,
     ) -> StimulusSequenceUnit:
-        unit = StimulusSequenceUnit(
+        return StimulusSequenceUnit(
             frequency=frequency,
             duration=duration,
-            interval=self._trial_config.stimulus_interval,
-        )
-        self._configure_unit_volume(unit, master_volume, digital_volume)
-        return unit
-
-    def _configure_unit_volume(
-        self,
-        unit: StimulusSequenceUnit,
-        master_volume: int,
-        digital_volume: int,
-    ) -> None:
-        unit.master_volume = master_volume
-        unit.digital_volume = digital_volume
-
-    def _prepare_stimulus(
-        self, stimulus_units: list[StimulusSequenceUnit], total_duration: int
-    ) -> list[StimulusSequenceUnit]:
-        return self._theater.aplayer.generate_stimulus_sequence(
-            stimulus_units, total_duration
+            interval=interval,
+            master_volume=master_volume,
+            digital_volume=digital_volume,
         )
 
     def _give_stimulus(
-        self, stimulus_units: list[StimulusSequenceUnit]
-    ) -> "Future[bool]":
-        return self._theater.aplayer.play_stimulus_sequence(stimulus_units)
+        self, stimulus: RenderedStimulus, onset: float
+    ) -> "Future[float | None]":
+        return self._theater.aplayer.play_at(stimulus, onset)
 
     def _give_reward(self) -> None:
         self._persistent_data.rewards += 1
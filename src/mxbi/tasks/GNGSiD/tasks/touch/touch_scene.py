@@ -21,6 +21,7 @@ if TYPE_CHECKING:
     from mxbi.tasks.GNGSiD.models import PersistentData
     from mxbi.tasks.GNGSiD.tasks.touch.touch_models import TrialConfig
     from mxbi.theater import Theater
+    from mxbi.utils.aplayer import APlayer
 
 
 class GNGSiDTouchScene:
@@ -39,7 +40,7 @@ class GNGSiDTouchScene:
         self._trial_config: "Final[TrialConfig]" = trial_config
         self._persistent_data: "Final[PersistentData]" = persistent_data
 
-        self._tone = self._prepare_stimulus()
+        self._tone = self.prepare_stimulus(theater.aplayer, trial_config)
 
         self._set_stimulus_intensity()
 
@@ -68,6 +69,7 @@ class GNGSiDTouchScene:
         self._background.after(
             self._trial_config.inter_trial_interval, self._on_trial_end
         )
+        self._theater.inter_trial()
 
     def _on_trial_end(self) -> None:
         self._background.destroy()
@@ -104,6 +106,7 @@ class GNGSiDTouchScene:
             correct=self._animal_state.correct_trial,
             incorrect=self._persistent_data.incorrect,
             timeout=self._persistent_data.timeout,
+            recent=round(self._persistent_data.recent_correct_rate, 2),
         )
         self._show_data_widget.show_data(data.model_dump())
 
@@ -193,22 +196,25 @@ class GNGSiDTouchScene:
     # endregion
 
     # region sitimulus and reward
-    def _prepare_stimulus(self) -> "NDArray[int16]":
+    @staticmethod
+    def prepare_stimulus(
+        aplayer: "APlayer", trial_config: "TrialConfig"
+    ) -> "NDArray[int16]":
+        """Build the stimulus buffer, safe to call off the Tk thread."""
         unit_duration = (
-            self._trial_config.stimulus_freq_duration
-            + self._trial_config.stimulus_freq_duration
+            trial_config.stimulus_freq_duration + trial_config.stimulus_freq_duration
         )
 
-        times = ceil(self._trial_config.stimulus_duration / unit_duration)
+        times = ceil(trial_config.stimulus_duration / unit_duration)
         times = max(times, 1)
 
         freq_1 = ToneConfig(
-            frequency=self._trial_config.stimulus_freq,
-            duration=self._trial_config.stimulus_freq_duration,
+            frequency=trial_config.stimulus_freq,
+            duration=trial_config.stimulus_freq_duration,
         )
-        freq_2 = ToneConfig(frequency=0, duration=self._trial_config.stimulus_interval)
+        freq_2 = ToneConfig(frequency=0, duration=trial_config.stimulus_interval)
 
-        return self._theater.aplayer.generate_stimulus([freq_1, freq_2], times)
+        return aplayer.generate_stimulus([freq_1, freq_2], times)
 
     def _give_stimulus(self) -> "Future[bool]":
         return self._theater.aplayer.play_stimulus(self._tone)
@@ -7,7 +7,7 @@ from mxbi.tasks.default.initial_habituation_training.models import (
     DataToShow,
     DetectStageConfig,
     TrialData,
-    config,
+    load_config,
 )
 from mxbi.utils.logger import logger
 from mxbi.utils.tkinter.components.canvas_with_border import CanvasWithInnerBorder
@@ -118,6 +118,7 @@ class InitialHabituationTraining:
         self._theater.reward.give_reward(self._stage_config.params.reward_duration)
 
     def _load_stage_config(self, monkey: str) -> DetectStageConfig:
+        config = load_config()
         stage_config = config.root.get(monkey) or config.root.get("default")
         if stage_config is None:
             raise ValueError("No default stage config found")
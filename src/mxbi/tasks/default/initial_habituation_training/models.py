@@ -1,3 +1,4 @@
+from functools import cache
 from pathlib import Path
 
 from pydantic import BaseModel, ConfigDict, RootModel
@@ -46,4 +47,6 @@ class DataToShow(BaseModel):
     rewards: int
 
 
-config = Configure(CONFIG_PATH, DetectStageConfigs).value
+@cache
+def load_config() -> DetectStageConfigs:
+    return Configure(CONFIG_PATH, DetectStageConfigs).value
@@ -1,27 +1,46 @@
+from collections.abc import Iterator, Mapping
+from importlib import import_module
+
 from mxbi.models.task import TaskEnum
-from mxbi.tasks.default.error_task.error_scene import ErrorScene
-from mxbi.tasks.default.idle_task.idle_scene import IDLEScene
-from mxbi.tasks.default.initial_habituation_training.initial_habituation_training import (
-    InitialHabituationTraining,
-)
-from mxbi.tasks.GNGSiD.stages.detect_stage.detect_stage import GNGSiDDetectStage
-from mxbi.tasks.GNGSiD.stages.discriminate_stage.discriminate_stage import (
-    GNGSiDDiscriminateStage,
-)
-from mxbi.tasks.GNGSiD.stages.size_reduction_stage.size_reduction_stage import (
-    SizeReductionStage,
-)
 from mxbi.tasks.task_protocol import Task
-from mxbi.tasks.two_alternative_choice.stages.size_reduction_stage.size_reduction_stage import (
-    TWOACSizeReductionStage,
-)
+from mxbi.utils.logger import logger
+
+
+class TaskRegistry(Mapping[TaskEnum, type[Task]]):
+    """Map tasks to ``"module:attribute"`` import strings, resolved on first use.
 
-task_table: dict[TaskEnum, type[Task]] = {
-    TaskEnum.IDEL: IDLEScene,
-    TaskEnum.ERROR: ErrorScene,
-    TaskEnum.HABITUATION: InitialHabituationTraining,
-    TaskEnum.GNGSiD_SIZE_REDUCTION_STAGE: SizeReductionStage,
-    TaskEnum.GNGSiD_DETECT_STAGE: GNGSiDDetectStage,
-    TaskEnum.GNGSiD_DISCRIMINATE_STAGE: GNGSiDDiscriminateStage,
-    TaskEnum.TWOAC_SIZE_REDUCTION_STAGE: TWOACSizeReductionStage,
-}
+    Stage modules validate their config when they are first used, so a rig
+    only pays the import and validation cost for the task families it runs.
+    """
+
+    def __init__(self, import_paths: dict[TaskEnum, str]) -> None:
+        self._import_paths = import_paths
+        self._tasks: dict[TaskEnum, type[Task]] = {}
+
+    def __getitem__(self, task_enum: TaskEnum) -> type[Task]:
+        task = self._tasks.get(task_enum)
+        if task is None:
+            module_path, _, attribute = self._import_paths[task_enum].partition(":")
+            logger.debug(f"Loading task {task_enum} from {module_path}")
+            task = getattr(import_module(module_path), attribute)
+            self._tasks[task_enum] = task
+        return task
+
+    def __iter__(self) -> Iterator[TaskEnum]:
+        return iter(self._import_paths)
+
+    def __len__(self) -> int:
+        return len(self._import_paths)
+
+
+task_table = TaskRegistry(
+    {
+        TaskEnum.IDEL: "mxbi.tasks.default.idle_task.idle_scene:IDLEScene",
+        TaskEnum.ERROR: "mxbi.tasks.default.error_task.error_scene:ErrorScene",
+        TaskEnum.HABITUATION: "mxbi.tasks.default.initial_habituation_training.initial_habituation_training:InitialHabituationTraining",
+        TaskEnum.GNGSiD_SIZE_REDUCTION_STAGE: "mxbi.tasks.GNGSiD.stages.size_reduction_stage.size_reduction_stage:SizeReductionStage",
+        TaskEnum.GNGSiD_DETECT_STAGE: "mxbi.tasks.GNGSiD.stages.detect_stage.detect_stage:GNGSiDDetectStage",
+        TaskEnum.GNGSiD_DISCRIMINATE_STAGE: "mxbi.tasks.GNGSiD.stages.discriminate_stage.discriminate_stage:GNGSiDDiscriminateStage",
+        TaskEnum.TWOAC_SIZE_REDUCTION_STAGE: "mxbi.tasks.two_alternative_choice.stages.size_reduction_stage.size_reduction_stage:TWOACSizeReductionStage",
+    }
+)
@@ -0,0 +1,62 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from mxbi.utils.logger import logger
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+    from mxbi.models.animal import AnimalState
+    from mxbi.theater import Theater
+
+PrefetchKey = tuple[type, str, int]
+
+
+class TrialPrefetcher:
+    """Prepare the next trial of a stage on a worker thread during the ITI.
+
+    Stages that define a ``prepare_trial(theater, animal_state)`` classmethod
+    can be prefetched: it draws the trial config and renders its audio into the
+    APlayer caches. The next stage instance claims the result with ``take``; a
+    prefetch made for another stage, animal or level is discarded.
+    """
+
+    def __init__(self) -> None:
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="trial-prefetch")
+        self._pending: tuple[PrefetchKey, Future[BaseModel]] | None = None
+
+    def prefetch(
+        self, stage: type, theater: "Theater", animal_state: "AnimalState"
+    ) -> None:
+        prepare_trial = getattr(stage, "prepare_trial", None)
+        if prepare_trial is None:
+            return
+
+        # the scheduler keeps mutating the live state while the worker runs
+        snapshot = animal_state.model_copy(deep=True)
+        key = (stage, snapshot.name, snapshot.level)
+        self._pending = (key, self._executor.submit(prepare_trial, theater, snapshot))
+
+    def take(self, stage: type, animal_state: "AnimalState") -> "BaseModel | None":
+        """Return the prefetched trial config if it matches, waiting if needed."""
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return None
+
+        key, future = pending
+        if key != (stage, animal_state.name, animal_state.level):
+            future.cancel()
+            return None
+
+        error = future.exception()
+        if error is not None:
+            # whatever failed, the stage prepares the trial itself and raises
+            # there if the failure was not specific to the worker
+            logger.opt(exception=error).error(
+                f"Prefetching the next trial of {stage.__name__} failed"
+            )
+            return None
+        return future.result()
+
+
+trial_prefetcher = TrialPrefetcher()
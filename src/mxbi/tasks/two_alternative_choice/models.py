@@ -3,6 +3,8 @@ from typing import TypeAlias
 
 from pydantic import BaseModel
 
+from mxbi.models.audio import AudioTiming
+
 LevelID: TypeAlias = int
 MonkeyName: TypeAlias = str
 
@@ -48,6 +50,7 @@ class BaseTrialData(BaseModel):
     result: Result
     correct_rate: float
     touch_events: list[TouchEvent]
+    audio_timings: list[AudioTiming] = []
 
 
 class BaseDataToShow(BaseModel):
@@ -59,6 +62,7 @@ class BaseDataToShow(BaseModel):
     correct: int
     incorrect: int
     timeout: int
+    recent: float
 
 
 class PersistentData(BaseModel):
@@ -66,3 +70,4 @@ class PersistentData(BaseModel):
     correct: int
     incorrect: int
     timeout: int
+    recent_correct_rate: float = 0.0
@@ -1,9 +1,10 @@
 from typing import TYPE_CHECKING, Final
 
 from mxbi.data_logger import DataLogger
+from mxbi.performance_index import performance_index
 from mxbi.tasks.two_alternative_choice.models import PersistentData, Result
 from mxbi.tasks.two_alternative_choice.stages.size_reduction_stage.size_reduction_models import (
-    config,
+    load_config,
 )
 from mxbi.tasks.two_alternative_choice.tasks.touch.touch_scene import TwoACTouchScene
 from mxbi.utils.logger import logger
@@ -17,8 +18,6 @@ if TYPE_CHECKING:
     )
     from mxbi.theater import Theater
 
-_presistent_data: dict[str, PersistentData] = {}
-
 
 class TWOACSizeReductionStage:
     STAGE_NAME: Final[str] = "twoac_size_reduction_stage"
@@ -45,16 +44,8 @@ class TWOACSizeReductionStage:
             self._session_state, self._animal_state.name, self.STAGE_NAME
         )
 
-        self._presistent_data = _presistent_data.get(self._animal_state.name)
-
-        if self._presistent_data is None:
-            self._presistent_data = PersistentData(
-                rewards=0,
-                correct=0,
-                incorrect=0,
-                timeout=0,
-            )
-            _presistent_data[self._animal_state.name] = self._presistent_data
+        self._presistent_data = self._load_persistent_data()
+        self._rewards_before_trial = self._presistent_data.rewards
 
         self._task = TwoACTouchScene(
             theater,
@@ -67,9 +58,16 @@ class TWOACSizeReductionStage:
 
     def start(self) -> "Feedback":
         trial_data = self._task.start()
+        trial_data.audio_timings = self._theater.aplayer.take_timings()
         self._data_logger.save_jsonl(trial_data.model_dump())
 
         feedback = self._handle_result(trial_data.result)
+        performance_index.record_trial(
+            self._animal_state.name,
+            self.STAGE_NAME,
+            trial_data.result,
+            rewards=self._presistent_data.rewards - self._rewards_before_trial,
+        )
         logger.debug(
             f"{self.STAGE_NAME}: "
             f"session_id={self._session_state.session_id}, "
@@ -83,22 +81,32 @@ class TWOACSizeReductionStage:
         return feedback
 
     def _load_stage_config(self, monkey: str) -> "SizeReductionStageConfig":
+        config = load_config()
         stage_config = config.root.get(monkey) or config.root.get("default")
         if stage_config is None:
             raise ValueError("No default stage config found")
         return stage_config
 
+    def _load_persistent_data(self) -> PersistentData:
+        daily = performance_index.daily(self._animal_state.name, self.STAGE_NAME)
+        return PersistentData(
+            **daily.model_dump(),
+            recent_correct_rate=performance_index.recent_correct_rate(
+                self._animal_state.name, self.STAGE_NAME
+            ),
+        )
+
     def _handle_result(self, result: "Result") -> "Feedback":
         feedback = False
         match result:
             case Result.CORRECT:
-                _presistent_data[self._animal_state.name].correct += 1
+                self._presistent_data.correct += 1
                 feedback = True
             case Result.INCORRECT:
-                _presistent_data[self._animal_state.name].incorrect += 1
+                self._presistent_data.incorrect += 1
                 feedback = False
             case Result.TIMEOUT:
-                _presistent_data[self._animal_state.name].timeout += 1
+                self._presistent_data.timeout += 1
                 feedback = False
             case Result.CANCEL:
                 feedback = False
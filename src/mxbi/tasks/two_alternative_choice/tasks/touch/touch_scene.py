@@ -68,6 +68,7 @@ class TwoACTouchScene:
         self._background.after(
             self._trial_config.inter_trial_interval, self._on_trial_end
         )
+        self._theater.inter_trial()
 
     def _on_trial_end(self) -> None:
         self._background.destroy()
@@ -104,6 +105,7 @@ class TwoACTouchScene:
             correct=self._animal_state.correct_trial,
             incorrect=self._persistent_data.incorrect,
             timeout=self._persistent_data.timeout,
+            recent=round(self._persistent_data.recent_correct_rate, 2),
         )
         self._show_data_widget.show_data(data.model_dump())
 
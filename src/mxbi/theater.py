@@ -4,7 +4,7 @@ from typing import Callable
 
 from mss import mss, tools
 
-from mxbi.config import session_config
+from mxbi.config import animal_states, session_config
 from mxbi.data_logger import DataLogger
 from mxbi.models.session import SessionConfig, SessionState
 from mxbi.peripheral.audio_player.controller.controller import Controller
@@ -18,11 +18,15 @@ from mxbi.scheduler import Scheduler
 from mxbi.utils.aplayer import APlayer
 from mxbi.utils.detect_platform import PlatformEnum
 from mxbi.utils.logger import logger
+from mxbi.utils.startup_profiler import startup_profiler
 
 
 class Theater:
     def __init__(self) -> None:
         self._config = session_config.value
+        with startup_profiler.phase("DataLogger.recover"):
+            DataLogger.recover()
+
         self._session_state = SessionState(
             session_id=DataLogger.init_session_id(),
             start_time=datetime.now().timestamp(),
@@ -33,16 +37,25 @@ class Theater:
 
         # callback for quit event
         self._on_quit: list[Callable[[], None]] = []
-
-        self._rewarder = self._init_rewarder()
-        self._acontroller = self._init_audio_controller()
-        self._aplayer = APlayer(self)
+        # callback for the start of an inter-trial interval
+        self._on_inter_trial: list[Callable[[], None]] = []
+
+        with startup_profiler.phase("Theater._init_rewarder"):
+            self._rewarder = self._init_rewarder()
+        with startup_profiler.phase("Theater._init_audio_controller"):
+            self._acontroller = self._init_audio_controller()
+        with startup_profiler.phase("APlayer"):
+            self._aplayer = APlayer(
+                self, self._config.audio_channels, self._config.audio_sink
+            )
 
         # init theater
-        self._init_tk()
+        with startup_profiler.phase("Theater._init_tk"):
+            self._init_tk()
         self._bind_event()
 
-        self._scheduler = Scheduler(self)
+        with startup_profiler.phase("Scheduler"):
+            self._scheduler = Scheduler(self)
         self._scheduler.start()
 
     def _init_rewarder(self) -> Rewarder:
@@ -51,7 +64,7 @@ class Theater:
     def _init_audio_controller(self):
         match self._config.platform:
             case PlatformEnum.RASPBERRY:
-                return AudioControllerFactory.create(AudioControllerEnum.AMIXER)
+                return AudioControllerFactory.create(AudioControllerEnum.AMIXER_BATCH)
             case _:
                 return AudioControllerFactory.create(AudioControllerEnum.MOCK)
 
@@ -73,11 +86,22 @@ class Theater:
         self._session_logger.save_json(self._session_state.model_dump())
         for callback in self._on_quit:
             callback()
+        DataLogger.close_writers()
+        session_config.flush()
+        animal_states.flush()
         self._root.destroy()
 
     def register_event_quit(self, callback: Callable[[], None]) -> None:
         self._on_quit.append(callback)
 
+    def register_event_inter_trial(self, callback: Callable[[], None]) -> None:
+        self._on_inter_trial.append(callback)
+
+    def inter_trial(self) -> None:
+        """Notify listeners that the running trial entered its ITI."""
+        for callback in self._on_inter_trial:
+            callback()
+
     def caputre(self, region: Canvas):
         region.update()
 
@@ -16,6 +16,7 @@ from mxbi.ui.components.fileds.labeled_combobox import (
 )
 from mxbi.ui.components.fileds.labeled_textbox import create_textbox
 from mxbi.utils.detect_platform import PlatformEnum
+from mxbi.utils.startup_profiler import startup_profiler
 
 
 class LaunchPanel:
@@ -24,10 +25,13 @@ class LaunchPanel:
     def __init__(
         self,
     ) -> None:
-        self._root = Tk()
-        self._root.title("mxbi")
-        self._init_ui()
-        self._root.mainloop()
+        with startup_profiler.phase("LaunchPanel"):
+            self._root = Tk()
+            self._root.title("mxbi")
+            self._init_ui()
+        # operator time spent in the panel is not part of the startup profile
+        with startup_profiler.excluded():
+            self._root.mainloop()
 
     def _init_ui(self) -> None:
         self._frame = Frame(self._root)
@@ -230,18 +234,21 @@ class LaunchPanel:
         self._save_and_close(config)
 
     def _build_session_config(self, experimenter: str, comments: str) -> SessionConfig:
-        return SessionConfig(
-            experimenter=experimenter,
-            xbi_id=self.combo_xbi.get(),
-            reward_type=RewardEnum(self.combo_reward.get()),
-            pump_type=PumpEnum(self.combo_pump.get()),
-            platform=PlatformEnum(self.combo_platform.get()),
-            detector=DetectorEnum(self.combo_detector.get()),
-            detector_port=self._selected_detector_port(),
-            detector_baudrate=self._selected_detector_baudrate(),
-            screen_type=self._selected_screen_type(),
-            comments=comments,
-            animals=self._collect_animals(),
+        # fields the panel does not edit keep their saved values
+        return session_config.value.model_copy(
+            update={
+                "experimenter": experimenter,
+                "xbi_id": self.combo_xbi.get(),
+                "reward_type": RewardEnum(self.combo_reward.get()),
+                "pump_type": PumpEnum(self.combo_pump.get()),
+                "platform": PlatformEnum(self.combo_platform.get()),
+                "detector": DetectorEnum(self.combo_detector.get()),
+                "detector_port": self._selected_detector_port(),
+                "detector_baudrate": self._selected_detector_baudrate(),
+                "screen_type": self._selected_screen_type(),
+                "comments": comments,
+                "animals": self._collect_animals(),
+            }
         )
 
     def _collect_animals(self) -> dict[str, AnimalConfig]:
@@ -1,7 +1,8 @@
+from collections import deque
 from concurrent.futures import Future, ThreadPoolExecutor
-from dataclasses import dataclass
-from functools import lru_cache
+from dataclasses import dataclass, field
 from threading import Event
+from time import monotonic, time
 from typing import TYPE_CHECKING
 
 import numpy as np
@@ -9,9 +10,30 @@ import pyaudio
 from numpy.typing import NDArray
 from pydantic import BaseModel
 
+from mxbi.models.audio import (
+    AudioDeviceHealth,
+    AudioDeviceStateEnum,
+    AudioTiming,
+    NullSinkConfig,
+)
+from mxbi.peripheral.audio_player.controller.config import digital_values
+from mxbi.utils.audio_device import AudioDevice, AudioDeviceManager, NullSinkDevice
+from mxbi.utils.logger import logger
+from mxbi.utils.synthesis import (
+    DEFAULT_SAMPLE_RATE,
+    BaseSynthConfig,
+    ByteBudgetCache,
+    ToneComplexConfig,
+    clear_synthesis_cache,
+    synthesize,
+)
+
 if TYPE_CHECKING:
     from mxbi.theater import Theater
 
+# output channels a mono buffer plays on, None for all of them
+Routing = tuple[int, ...] | None
+
 
 @dataclass
 class StimulusSequenceUnit:
@@ -21,6 +43,40 @@ class StimulusSequenceUnit:
     stimulus: NDArray[np.int16] | None = None
     master_volume: int | None = None
     digital_volume: int | None = None
+    channels: Routing = None
+
+
+@dataclass
+class MixLayer:
+    """A buffer placed on the mix timeline; mono samples follow ``channels``."""
+
+    samples: NDArray[np.int16]
+    offset: int = 0  # frames
+    channels: Routing = None
+    master_volume: int | None = None
+    digital_volume: int | None = None
+
+
+@dataclass
+class RenderedStimulus:
+    """A sequence baked into one buffer that plays with a single volume setting.
+
+    ``samples`` are laid out as (frames, channels) for the stream they were
+    rendered for, with ``layers`` placed in them as they were mixed. Units
+    with different Master values cannot share a hardware volume, so such a
+    sequence is split into ``parts`` played back to back, each with its own
+    volume; ``samples`` then holds every part in order.
+    """
+
+    samples: NDArray[np.int16]
+    master_volume: int | None = None
+    digital_volume: int | None = None
+    layers: list[MixLayer] = field(default_factory=list)
+    parts: list["RenderedStimulus"] = field(default_factory=list)
+
+    @property
+    def nbytes(self) -> int:
+        return self.samples.nbytes + sum(part.samples.nbytes for part in self.parts)
 
 
 class ToneConfig(BaseModel):
@@ -28,60 +84,288 @@ class ToneConfig(BaseModel):
     duration: int  # ms
 
 
-SAMPLE_RATE = 44100
+SAMPLE_RATE = DEFAULT_SAMPLE_RATE
+SAMPLE_BYTES = 2  # int16
+FRAMES_PER_BUFFER = 256
+SEQUENCE_CACHE_BYTES = 32 * 1024 * 1024
+
+SequenceRecipe = tuple[tuple[int, int, int, int | None, int | None, Routing], ...]
+SequenceKey = tuple[SequenceRecipe, int, tuple[int, int] | None]
+StimulusKey = tuple[tuple[tuple[int, int] | BaseSynthConfig, ...], int]
+INT16_MIN = np.iinfo(np.int16).min
+INT16_MAX = np.iinfo(np.int16).max
+# device states in which the stream callback runs and resolves playbacks
+PLAYABLE_STATES = (AudioDeviceStateEnum.HEALTHY, AudioDeviceStateEnum.DEGRADED)
+
+
+@dataclass
+class Playback:
+    """A buffer queued on the output stream; frames are stream frame indices."""
+
+    data: memoryview
+    timing: AudioTiming
+    future: "Future[bool]" = field(default_factory=Future)
+    # monotonic onset, None when stopped before the first sample
+    onset: "Future[float | None]" = field(default_factory=Future)
+    start_at: float | None = None  # requested monotonic onset
+    position: int = 0  # bytes
+    start_frame: int | None = None
+    end_frame: int | None = None
+    stop_requested: bool = False
+
+
+def _resolve(future: Future, result: object) -> None:
+    # on the notifier thread, which serialises it with the callback's results
+    if not future.done():
+        future.set_result(result)
 
 
-@lru_cache(maxsize=128)
 def _cached_wave_unit(frequency: int, duration: int) -> NDArray[np.int16]:
-    samples = int(SAMPLE_RATE * (duration / 1000))
-    if samples <= 0:
-        return np.zeros(0, dtype=np.int16)
+    return synthesize(ToneComplexConfig(frequencies=(frequency,), duration=duration))
+
+
+def _readonly(array: NDArray[np.int16]) -> NDArray[np.int16]:
+    """Mark a shared cached array read-only so callers can use it without copies."""
+    array.flags.writeable = False
+    return array
+
+
+# digital_values inverted: Digital control value -> calibrated level in dB
+_DIGITAL_LEVELS = sorted((value, level) for level, value in digital_values.items())
+_DIGITAL_VALUES = np.array([value for value, _ in _DIGITAL_LEVELS], dtype=np.float64)
+_DIGITAL_DB = np.array([level for _, level in _DIGITAL_LEVELS], dtype=np.float64)
+
+
+def _volume_level_db(
+    master_volume: int | None, digital_volume: int | None
+) -> float | None:
+    """Calibrated output level of a volume pair in dB.
+
+    ``master_values`` is the per-frequency Master setting that makes a
+    ``digital_values`` key the output level, so the level is that key for the
+    frequency the Master value was calibrated at. The Master attenuation in dB
+    is not known, so levels only compare between pairs with the same Master
+    value. Values between table entries are interpolated.
+    """
+    if master_volume is None or digital_volume is None:
+        return None
+    return float(np.interp(digital_volume, _DIGITAL_VALUES, _DIGITAL_DB))
+
+
+def _sequence_recipe(units: list[StimulusSequenceUnit]) -> SequenceRecipe | None:
+    """Hashable description of tone units, None if a unit carries its own samples."""
+    recipe = []
+    for unit in units:
+        if unit.stimulus is not None or unit.frequency is None or unit.duration is None:
+            return None
+        recipe.append(
+            (
+                unit.frequency,
+                unit.duration,
+                unit.interval,
+                unit.master_volume,
+                unit.digital_volume,
+                unit.channels,
+            )
+        )
+    return tuple(recipe)
 
-    t = np.arange(samples) / SAMPLE_RATE
-    tone = np.sin(2 * np.pi * frequency * t)
 
-    fade_samples = min(int(4.5 * SAMPLE_RATE / 1000), samples // 2)
-    if fade_samples > 0:
-        envelope = np.ones(samples)
-        envelope[:fade_samples] = np.linspace(0, 1, fade_samples)
-        envelope[-fade_samples:] = np.linspace(1, 0, fade_samples)
-        tone *= envelope
+def _columns(channels: Routing, output_channels: int) -> slice | list[int]:
+    if channels is None:
+        return slice(None)
+    if not channels or not all(0 <= c < output_channels for c in channels):
+        raise ValueError(
+            f"Channels {channels} are not routable to {output_channels} outputs"
+        )
+    return list(channels)
+
+
+def route(
+    samples: NDArray[np.int16], channels: Routing, output_channels: int
+) -> NDArray[np.int16]:
+    """Lay samples out as (frames, output_channels), silent on unrouted channels.
+
+    Mono samples are copied to every routed channel; multi-channel samples
+    need one column per routed channel. Already matching buffers are returned
+    as is.
+    """
+    if samples.ndim == 1:
+        if output_channels == 1 and channels in (None, (0,)):
+            return samples.reshape(-1, 1)
+        samples = samples[:, None]
+    elif channels is None and samples.shape[1] == output_channels:
+        return samples
+
+    out = np.zeros((len(samples), output_channels), dtype=np.int16)
+    out[:, _columns(channels, output_channels)] = samples
+    return out
+
+
+def mix(
+    layers: list[MixLayer],
+    output_channels: int,
+    reference: tuple[int, int] | None = None,
+    normalize: bool = False,
+) -> NDArray[np.int16]:
+    """Sum layers into one (frames, output_channels) int16 buffer.
+
+    Layers with a volume are scaled by their level relative to ``reference``
+    (master, digital), the hardware volume the mix is played at. Overlapping
+    layers are summed at full precision and then clipped to int16, or scaled
+    down as a whole if ``normalize`` is set.
+    """
+    length = max((layer.offset + len(layer.samples) for layer in layers), default=0)
+    acc = np.zeros((length, output_channels), dtype=np.float64)
+    reference_level = _volume_level_db(*reference) if reference else None
+
+    for layer in layers:
+        samples = layer.samples[:, None] if layer.samples.ndim == 1 else layer.samples
+        target = (
+            slice(layer.offset, layer.offset + len(samples)),
+            _columns(layer.channels, output_channels),
+        )
+        level = _volume_level_db(layer.master_volume, layer.digital_volume)
+        if reference_level is None or level is None or level == reference_level:
+            acc[target] += samples
+        else:
+            acc[target] += samples * 10 ** ((level - reference_level) / 20)
+
+    peak = np.abs(acc).max(initial=0.0)
+    if peak > INT16_MAX:
+        if normalize:
+            acc *= INT16_MAX / peak
+        else:
+            clipped = np.count_nonzero((acc > INT16_MAX) | (acc < INT16_MIN))
+            logger.debug(f"Mix clipped {clipped} samples, peak {peak:.0f}")
+            np.clip(acc, INT16_MIN, INT16_MAX, out=acc)
+    return acc.astype(np.int16)
+
+
+def loudest_volume(
+    units: list[StimulusSequenceUnit | MixLayer | tuple[int, int]],
+    master_volume: int | None = None,
+) -> tuple[int, int] | None:
+    """(master, digital) volume of the loudest unit or volume pair, if any.
+
+    With ``master_volume`` only pairs with that Master value are considered.
+    """
+    volumes = [
+        unit if isinstance(unit, tuple) else (unit.master_volume, unit.digital_volume)
+        for unit in units
+    ]
+    candidates = [
+        (master, digital)
+        for master, digital in volumes
+        if master is not None
+        and digital is not None
+        and master_volume in (None, master)
+    ]
+    return max(candidates, key=lambda v: _volume_level_db(*v), default=None)
+
+
+def check_levels(rendered: RenderedStimulus, tolerance: float = 0.1) -> list[str]:
+    """Compare every layer's effective level with its calibrated volume.
+
+    The gain of a layer is measured from the rendered samples, so clipping or
+    a part played at another Master value shows up as a mismatch. Returns one
+    message per mismatching layer.
+    """
+    errors: list[str] = []
+    for index, part in enumerate(rendered.parts or [rendered]):
+        reference_level = _volume_level_db(part.master_volume, part.digital_volume)
+        for layer in part.layers:
+            level = _volume_level_db(layer.master_volume, layer.digital_volume)
+            if level is None or reference_level is None:
+                continue
+            if layer.master_volume != part.master_volume:
+                errors.append(
+                    f"Part {index} plays a layer calibrated for Master "
+                    f"{layer.master_volume} at Master {part.master_volume}"
+                )
+                continue
 
-    max_val = np.iinfo(np.int16).max
-    return (tone * max_val).astype(np.int16)
+            raw = layer.samples if layer.samples.ndim == 1 else layer.samples[:, 0]
+            raw = raw.astype(np.float64)
+            energy = np.dot(raw, raw)
+            if energy == 0:
+                continue
+            column = _columns(layer.channels, part.samples.shape[1])
+            out = part.samples[layer.offset : layer.offset + len(raw), column]
+            gain = np.dot(out[:, 0].astype(np.float64), raw) / energy
+            effective = reference_level + 20 * np.log10(max(gain, 1e-12))
+            if abs(effective - level) > tolerance:
+                errors.append(
+                    f"Part {index} plays a layer at offset {layer.offset} at "
+                    f"{effective:.2f} dB instead of {level:.2f} dB"
+                )
+    return errors
 
 
 class APlayer:
-    def __init__(self, theater: "Theater") -> None:
+    def __init__(
+        self,
+        theater: "Theater",
+        channels: int = 1,
+        sink: NullSinkConfig | None = None,
+    ) -> None:
         self._theater = theater
+        self._channels = channels
+        self._frame_bytes = SAMPLE_BYTES * channels
         self._executor = ThreadPoolExecutor(1)
-        self._player = pyaudio.PyAudio()
+        # futures are resolved here so done callbacks never run on the audio
+        # thread and can wait on playbacks started by the executor
+        self._notifier = ThreadPoolExecutor(1)
         self._stop_event = Event()
-        self._stream = self._player.open(
-            format=pyaudio.paInt16,
-            channels=1,
-            rate=SAMPLE_RATE,
-            output=True,
+        self._sequence_cache: ByteBudgetCache[SequenceKey, RenderedStimulus] = (
+            ByteBudgetCache(SEQUENCE_CACHE_BYTES, lambda r: r.nbytes)
+        )
+        self._stimulus_cache: ByteBudgetCache[StimulusKey, NDArray[np.int16]] = (
+            ByteBudgetCache(SEQUENCE_CACHE_BYTES, lambda samples: samples.nbytes)
         )
 
-    def _gen_wave_unit(self, tone_config: ToneConfig) -> NDArray[np.int16]:
-        cached = _cached_wave_unit(
+        self._queue: deque[Playback] = deque()
+        self._playback: Playback | None = None
+        self._last_playback: Playback | None = None
+        self._frame_index = 0
+        self._silence = memoryview(bytes(FRAMES_PER_BUFFER * self._frame_bytes))
+
+        self._timings: list[AudioTiming] = []
+        self._device: AudioDevice
+        if sink is not None:
+            self._device = NullSinkDevice(
+                self._stream_callback, channels, SAMPLE_RATE, FRAMES_PER_BUFFER, sink
+            )
+        else:
+            # playbacks cut by a device failure are resolved as not completed
+            self._device = AudioDeviceManager(
+                self._stream_callback,
+                channels,
+                SAMPLE_RATE,
+                FRAMES_PER_BUFFER,
+                on_failure=self._drop_playbacks,
+            )
+
+    def _gen_wave_unit(
+        self, tone_config: ToneConfig | BaseSynthConfig
+    ) -> NDArray[np.int16]:
+        if isinstance(tone_config, BaseSynthConfig):
+            if tone_config.sample_rate != SAMPLE_RATE:
+                raise ValueError(
+                    f"Stimulus sample rate {tone_config.sample_rate} does not match "
+                    f"the output stream rate {SAMPLE_RATE}"
+                )
+            return synthesize(tone_config)
+
+        return _cached_wave_unit(
             tone_config.frequency,
             tone_config.duration,
         )
-        return cached.copy()
 
     def _gen_stimulus_unit(self, unit: StimulusSequenceUnit) -> StimulusSequenceUnit:
         """Ensure a stimulus unit has waveform data while retaining volume metadata."""
         if unit.stimulus is not None:
-            return StimulusSequenceUnit(
-                frequency=unit.frequency,
-                duration=unit.duration,
-                interval=unit.interval,
-                stimulus=unit.stimulus.copy(),
-                master_volume=unit.master_volume,
-                digital_volume=unit.digital_volume,
-            )
+            return unit
 
         if unit.frequency is None or unit.duration is None:
             raise ValueError(
@@ -102,14 +386,32 @@ class APlayer:
             stimulus=stimulus,
             master_volume=unit.master_volume,
             digital_volume=unit.digital_volume,
+            channels=unit.channels,
         )
 
     def generate_stimulus(
-        self, tone_config: list[ToneConfig], times: int
+        self, tone_config: list[ToneConfig | BaseSynthConfig], times: int
     ) -> NDArray[np.int16]:
         """Concatenate the configured tones and repeat them the requested number of times."""
-        tone_unit = np.concatenate([self._gen_wave_unit(cfg) for cfg in tone_config])
-        return np.tile(tone_unit, times)
+        waves = [self._gen_wave_unit(cfg) for cfg in tone_config]
+        if len(waves) == 1 and times == 1:
+            return waves[0]
+
+        key = (
+            tuple(
+                cfg
+                if isinstance(cfg, BaseSynthConfig)
+                else (cfg.frequency, cfg.duration)
+                for cfg in tone_config
+            ),
+            times,
+        )
+        stimulus = self._stimulus_cache.get(key)
+        if stimulus is None:
+            tone_unit = np.concatenate(waves)
+            stimulus = _readonly(np.tile(tone_unit, times) if times != 1 else tone_unit)
+            self._stimulus_cache.put(key, stimulus)
+        return stimulus
 
     def generate_stimulus_sequence(
         self, units: list[StimulusSequenceUnit], duration: int
@@ -131,76 +433,430 @@ class APlayer:
 
         k, r = divmod(duration, cycle_duration)
 
-        sequence = [self._gen_stimulus_unit(u) for _ in range(k) for u in units]
+        # every repetition shares the same read-only waveform
+        generated = [self._gen_stimulus_unit(u) for u in units]
+        sequence = [u for _ in range(k) for u in generated]
 
-        for unit, dur in zip(units, unit_durations):
+        for unit, dur in zip(generated, unit_durations):
             if r >= dur:
                 r -= dur
-                sequence.append(self._gen_stimulus_unit(unit))
+                sequence.append(unit)
             else:
                 break
 
         return sequence
 
-    def _play_stimulus(self, stimulus: "NDArray[np.int16]"):
-        """Internal helper for playback when no per-tone volume changes are needed."""
-        data = stimulus.tobytes()
-        chunk_size = 1024
-
+    def render_stimulus_sequence(
+        self,
+        units: list[StimulusSequenceUnit],
+        duration: int,
+        volume: tuple[int, int] | None = None,
+    ) -> RenderedStimulus:
+        """Render a sequence into one contiguous buffer with per-unit gain baked in.
+
+        The hardware is set once to the loudest unit's volume, or to ``volume``
+        (master, digital) if that is louder, and every other unit is attenuated
+        digitally by its level difference, so playback needs no mixer changes
+        between tones. Sharing ``volume`` lets separately rendered buffers play
+        back to back. Runs of units with another Master value are rendered as
+        separate parts against their own loudest volume, or ``volume`` if it
+        has their Master value. Results for tone-only recipes are cached.
+        """
+        recipe = _sequence_recipe(units)
+        if recipe is None:
+            return self._render_stimulus_sequence(units, duration, volume)
+
+        key = (recipe, duration, volume)
+        cached = self._sequence_cache.get(key)
+        if cached is None:
+            cached = self._render_stimulus_sequence(units, duration, volume)
+            self._sequence_cache.put(key, cached)
+        return cached
+
+    def _render_stimulus_sequence(
+        self,
+        units: list[StimulusSequenceUnit],
+        duration: int,
+        volume: tuple[int, int] | None,
+    ) -> RenderedStimulus:
+        sequence = self.generate_stimulus_sequence(units, duration)
+        volumes = [*units, *([volume] if volume else [])]
+
+        # runs of units sharing a Master value, units without a volume join any
+        runs: list[tuple[int | None, list[MixLayer]]] = []
         offset = 0
-        while chunk := data[offset : offset + chunk_size]:
-            if self._stop_event.is_set():
-                self._stop_event.clear()
-                return False
+        for unit in sequence:
+            if unit.stimulus is None:
+                continue
+            master = unit.master_volume if unit.digital_volume is not None else None
+            if not runs or None not in (master, runs[-1][0]) and master != runs[-1][0]:
+                runs.append((master, []))
+                offset = 0
+            elif runs[-1][0] is None:
+                runs[-1] = (master, runs[-1][1])
+            runs[-1][1].append(
+                MixLayer(
+                    samples=unit.stimulus,
+                    offset=offset,
+                    channels=unit.channels,
+                    master_volume=unit.master_volume,
+                    digital_volume=unit.digital_volume,
+                )
+            )
+            offset += len(unit.stimulus)
+
+        parts = []
+        for master, layers in runs or [(None, [])]:
+            reference = loudest_volume(volumes, master)
+            samples = mix(layers, self._channels, reference)
+            parts.append(self._rendered(samples, reference, layers))
+
+        if len(parts) == 1:
+            return parts[0]
+        samples = np.concatenate([part.samples for part in parts])
+        return RenderedStimulus(samples=_readonly(samples), parts=parts)
+
+    def render_mix(
+        self,
+        layers: list[MixLayer],
+        volume: tuple[int, int] | None = None,
+        normalize: bool = False,
+    ) -> RenderedStimulus:
+        """Mix possibly overlapping layers into one buffer for this stream.
+
+        Works like ``render_stimulus_sequence`` for volumes, with each layer
+        routed to its channels, e.g. lateralized cues on one stream. Layers
+        overlap, so they all need the same Master value.
+        """
+        masters = {
+            layer.master_volume
+            for layer in layers
+            if layer.master_volume is not None and layer.digital_volume is not None
+        }
+        if len(masters) > 1:
+            raise ValueError(
+                f"Layers with Master values {sorted(masters)} cannot share one "
+                "hardware volume"
+            )
+        reference = loudest_volume(
+            [*layers, *([volume] if volume else [])], next(iter(masters), None)
+        )
+        samples = mix(layers, self._channels, reference, normalize)
+        return self._rendered(samples, reference, layers)
+
+    @staticmethod
+    def _rendered(
+        samples: NDArray[np.int16],
+        reference: tuple[int, int] | None,
+        layers: list[MixLayer],
+    ) -> RenderedStimulus:
+        _readonly(samples)
+        if reference is None:
+            return RenderedStimulus(samples=samples, layers=layers)
+        return RenderedStimulus(
+            samples=samples,
+            master_volume=reference[0],
+            digital_volume=reference[1],
+            layers=layers,
+        )
 
-            self._stream.write(chunk)
-            offset += chunk_size
+    def _stream_callback(self, in_data, frame_count, time_info, status):
+        """Fill the buffer from queued playbacks back to back, silence when idle.
+
+        A playback with ``start_at`` is preceded by silence so its first sample
+        reaches the DAC at that monotonic time, or as soon as possible if late.
+        """
+        size = frame_count * self._frame_bytes
+        if len(self._silence) < size:
+            self._silence = memoryview(bytes(size))
+
+        now = time()
+        dac_delay = max(
+            time_info.get("output_buffer_dac_time", 0.0)
+            - time_info.get("current_time", 0.0),
+            0.0,
+        )
+        # monotonic time at which the first frame of this buffer is heard
+        buffer_onset = monotonic() + dac_delay
+
+        if self._playback is not None and status & pyaudio.paOutputUnderflow:
+            self._playback.timing.underflows += 1
+
+        chunks: list[memoryview | bytes] = []
+        filled = 0
+        while filled < size:
+            playback = self._playback
+            if playback is None:
+                if not self._queue:
+                    break
+                playback = self._playback = self._queue.popleft()
+
+            if playback.start_frame is None:
+                if playback.stop_requested:
+                    playback.start_frame = (
+                        self._frame_index + filled // self._frame_bytes
+                    )
+                    self._finish_playback(playback, completed=False)
+                    continue
+
+                lead = 0
+                if playback.start_at is not None:
+                    lead = round((playback.start_at - buffer_onset) * SAMPLE_RATE)
+                    lead = max(lead - filled // self._frame_bytes, 0)
+                    if lead * self._frame_bytes >= size - filled:
+                        break
+                if lead:
+                    chunks.append(self._silence[: lead * self._frame_bytes])
+                    filled += lead * self._frame_bytes
+
+                self._start_playback(playback, filled, now, dac_delay, buffer_onset)
+            elif playback.stop_requested:
+                self._finish_playback(playback, completed=False)
+                continue
 
-        self._stop_event.clear()
+            chunk = playback.data[playback.position : playback.position + size - filled]
+            chunks.append(chunk)
+            playback.position += len(chunk)
+            filled += len(chunk)
+            if playback.position >= len(playback.data):
+                self._finish_playback(playback, completed=True)
+
+        if filled < size:
+            chunks.append(self._silence[: size - filled])
+
+        self._frame_index += frame_count
+        data = chunks[0] if len(chunks) == 1 else b"".join(chunks)
+        return data, pyaudio.paContinue
+
+    def _start_playback(
+        self,
+        playback: Playback,
+        offset: int,
+        now: float,
+        dac_delay: float,
+        buffer_onset: float,
+    ) -> None:
+        frames = offset // self._frame_bytes
+        playback.start_frame = self._frame_index + frames
+        onset = buffer_onset + frames / SAMPLE_RATE
+
+        timing = playback.timing
+        if timing.first_write_at is None:
+            timing.first_write_at = now
+            timing.onset_at = now + dac_delay + frames / SAMPLE_RATE
+            timing.start_frame = playback.start_frame
+        self._notifier.submit(_resolve, playback.onset, onset)
+
+    def _finish_playback(self, playback: Playback, completed: bool) -> None:
+        assert playback.start_frame is not None
+        playback.end_frame = (
+            playback.start_frame + playback.position // self._frame_bytes
+        )
+        playback.timing.end_frame = playback.end_frame
+        playback.timing.completed_at = time()
+        playback.timing.completed = completed
+        self._playback = None
+        self._last_playback = playback
+        self._device.playback_finished(
+            playback.start_frame, playback.end_frame, playback.timing
+        )
+        if not playback.onset.done():
+            self._notifier.submit(_resolve, playback.onset, None)
+        self._notifier.submit(_resolve, playback.future, completed)
+
+    def _new_timing(self) -> AudioTiming:
+        timing = AudioTiming(
+            submitted_at=time(), output_latency=self._device.output_latency
+        )
+        self._timings.append(timing)
+        return timing
+
+    def _enqueue(
+        self,
+        stimulus: NDArray[np.int16],
+        timing: AudioTiming,
+        start_at: float | None = None,
+        queue: bool = True,
+        channels: Routing = None,
+    ) -> Playback:
+        frames = route(stimulus, channels, self._channels)
+        data = memoryview(np.ascontiguousarray(frames)).cast("B").toreadonly()
+        playback = Playback(data=data, timing=timing, start_at=start_at)
+        if queue:
+            self._append(playback)
+        return playback
+
+    def _append(self, playback: Playback) -> None:
+        """Queue a playback, or resolve it at once while the device is down."""
+        if self._device.health.state not in PLAYABLE_STATES:
+            self._abandon(playback)
+            return
+        self._queue.append(playback)
+
+    def _abandon(self, playback: Playback) -> None:
+        """Resolve a playback that will never reach the stream callback."""
+        playback.timing.completed = False
+        playback.timing.completed_at = time()
+        self._notifier.submit(_resolve, playback.onset, None)
+        self._notifier.submit(_resolve, playback.future, False)
+
+    def _drop_playbacks(self) -> None:
+        """Resolve the current and queued playbacks after the device failed."""
+        playback, self._playback = self._playback, None
+        dropped = [playback] if playback is not None else []
+        while self._queue:
+            dropped.append(self._queue.popleft())
+        for playback in dropped:
+            self._abandon(playback)
+        if dropped:
+            logger.warning(f"Dropped {len(dropped)} playbacks after a device failure")
+
+    def _set_volume(
+        self, master_volume: int | None, digital_volume: int | None
+    ) -> None:
+        if master_volume is not None and digital_volume is not None:
+            self._theater.acontroller.set_master_volume(master_volume)
+            self._theater.acontroller.set_digital_volume(digital_volume)
+
+    def _queue_rendered(
+        self, parts: list[RenderedStimulus], playback: Playback
+    ) -> None:
+        first, *rest = parts
+        self._set_volume(first.master_volume, first.digital_volume)
+        if self._stop_event.is_set():
+            self._abandon(playback)
+            return
+        self._append(playback)
+        if rest and playback.future.result():
+            self._play_rendered_parts(rest, playback.timing)
+
+    def _play_rendered_parts(
+        self, parts: list[RenderedStimulus], timing: AudioTiming
+    ) -> bool:
+        """Play parts back to back, applying each part's volume before it."""
+        for part in parts:
+            self._set_volume(part.master_volume, part.digital_volume)
+
+            if self._stop_event.is_set():
+                timing.completed = False
+                return False
+            if not self._enqueue(part.samples, timing).future.result():
+                return False
         return True
 
-    def _play_stimulus_sequence(self, tones: list[StimulusSequenceUnit]) -> bool:
+    def _play_stimulus_sequence(
+        self, tones: list[StimulusSequenceUnit], timing: AudioTiming
+    ) -> bool:
         """Internal helper that applies volume overrides before each stimulus unit."""
         for tone in tones:
-            if tone.master_volume is not None and tone.digital_volume is not None:
-                self._theater.acontroller.set_master_volume(tone.master_volume)
-                self._theater.acontroller.set_digital_volume(tone.digital_volume)
+            self._set_volume(tone.master_volume, tone.digital_volume)
 
             if tone.stimulus is None:
                 continue
 
-            data = tone.stimulus.tobytes()
-            chunk_size = 1024
-
-            offset = 0
-            while chunk := data[offset : offset + chunk_size]:
-                if self._stop_event.is_set():
-                    self._stop_event.clear()
-                    return False
-
-                self._stream.write(chunk)
-                offset += chunk_size
+            if self._stop_event.is_set():
+                timing.completed = False
+                return False
+            playback = self._enqueue(tone.stimulus, timing, channels=tone.channels)
+            if not playback.future.result():
+                return False
 
-        self._stop_event.clear()
         return True
 
-    def play_stimulus(self, stimulus: NDArray[np.int16]) -> Future[bool]:
+    def play_stimulus(
+        self, stimulus: NDArray[np.int16], channels: Routing = None
+    ) -> Future[bool]:
         """Play a single stimulus without adjusting system volume between tones."""
         self._stop_event.clear()
-        return self._executor.submit(self._play_stimulus, stimulus)
+        return self._enqueue(stimulus, self._new_timing(), channels=channels).future
 
     def play_stimulus_sequence(self, tones: list[StimulusSequenceUnit]) -> Future[bool]:
         """Play a sequence and update master/digital volume before each unit if provided."""
         self._stop_event.clear()
-        return self._executor.submit(self._play_stimulus_sequence, tones)
+        return self._executor.submit(
+            self._play_stimulus_sequence, tones, self._new_timing()
+        )
+
+    def play_rendered_stimulus(self, rendered: RenderedStimulus) -> Future[bool]:
+        """Play a rendered sequence, applying each part's volume before it."""
+        self._stop_event.clear()
+        return self._executor.submit(
+            self._play_rendered_parts,
+            rendered.parts or [rendered],
+            self._new_timing(),
+        )
+
+    def play_at(
+        self, stimulus: NDArray[np.int16] | RenderedStimulus, t_monotonic: float
+    ) -> "Future[float | None]":
+        """Play so that the first sample reaches the DAC at ``t_monotonic``.
+
+        ``t_monotonic`` is on the ``time.monotonic`` clock. The returned future
+        holds the achieved onset on that clock, or None if stopped before it
+        started. Completion is recorded in the audio timing. Further parts of a
+        rendered stimulus follow the first as soon as their volume is set.
+        """
+        self._stop_event.clear()
+        timing = self._new_timing()
+        timing.requested_onset_at = t_monotonic - monotonic() + time()
+
+        if isinstance(stimulus, RenderedStimulus):
+            parts = stimulus.parts or [stimulus]
+            playback = self._enqueue(parts[0].samples, timing, t_monotonic, False)
+            self._executor.submit(self._queue_rendered, parts, playback)
+        else:
+            playback = self._enqueue(stimulus, timing, t_monotonic)
+        return playback.onset
+
+    def take_timings(self) -> list[AudioTiming]:
+        """Return the timing of every play call since the last take, for TrialData."""
+        timings, self._timings = self._timings, []
+        return timings
 
     def stop(self) -> None:
+        """Stop the current and queued playbacks at the next buffer boundary."""
         self._stop_event.set()
+        # queued first, so a playback popped by the callback meanwhile is marked
+        for queued in list(self._queue):
+            queued.stop_requested = True
+        playback = self._playback
+        if playback is not None:
+            playback.stop_requested = True
+
+    @property
+    def last_playback(self) -> Playback | None:
+        """The last finished playback with the frames it started and ended at."""
+        return self._last_playback
+
+    def clear_caches(self) -> None:
+        """Drop every cached waveform and rendered sequence."""
+        self._sequence_cache.clear()
+        self._stimulus_cache.clear()
+        clear_synthesis_cache()
+
+    @property
+    def device(self) -> AudioDevice:
+        return self._device
+
+    @property
+    def health(self) -> AudioDeviceHealth:
+        """State of the output device and its recoveries so far."""
+        return self._device.health
+
+    @property
+    def channels(self) -> int:
+        """Channels of the output stream."""
+        return self._channels
+
+    @property
+    def frame_index(self) -> int:
+        """Frames handed to the output stream since it was opened."""
+        return self._frame_index
 
     def __del__(self) -> None:
-        self._stream.close()
-        self._player.terminate()
+        self._device.close()
         self._executor.shutdown(wait=False)
+        self._notifier.shutdown(wait=False)
 
 
 if __name__ == "__main__":
@@ -219,8 +875,8 @@ if __name__ == "__main__":
     ]
     sequence = player.generate_stimulus_sequence(sequence_units, duration=1201)
 
-    player._play_stimulus_sequence([StimulusSequenceUnit(stimulus=tone_s)])
-    player._play_stimulus_sequence(sequence)
+    player.play_stimulus_sequence([StimulusSequenceUnit(stimulus=tone_s)]).result()
+    player.play_stimulus_sequence(sequence).result()
 
     import matplotlib.pyplot as plt
 
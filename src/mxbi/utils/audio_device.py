@@ -0,0 +1,356 @@
+import wave
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime
+from itertools import islice
+from threading import Event, Lock, Thread
+from time import monotonic, sleep, time
+from typing import Any, Protocol
+
+import numpy as np
+import pyaudio
+
+from mxbi.models.audio import (
+    AudioDeviceHealth,
+    AudioDeviceStateEnum,
+    AudioTiming,
+    NullSinkConfig,
+    SinkRecording,
+)
+from mxbi.utils.logger import logger
+
+StreamCallback = Callable[[bytes | None, int, dict, int], tuple[Any, int]]
+
+WATCHDOG_INTERVAL = 0.5  # s
+STALL_TIMEOUT = 2.0  # s without a callback while the stream should be running
+UNDERFLOW_STORM_COUNT = 20
+UNDERFLOW_STORM_WINDOW = 5.0  # s
+REOPEN_BACKOFF = (0.5, 1.0, 2.0, 5.0, 10.0, 30.0)  # s, the last one repeats
+FAILED_AFTER_ATTEMPTS = 5
+SINK_HISTORY = 60.0  # s of output the null sink keeps to cut playbacks from
+SAMPLE_BYTES = 2  # int16
+
+
+class AudioDevice(Protocol):
+    """Output device driving an APlayer stream callback."""
+
+    @property
+    def health(self) -> AudioDeviceHealth: ...
+
+    @property
+    def output_latency(self) -> float: ...
+
+    def playback_finished(
+        self, start_frame: int, end_frame: int, timing: AudioTiming
+    ) -> None:
+        """Called on the audio thread when a playback leaves the stream."""
+        ...
+
+    def close(self) -> None: ...
+
+
+class AudioDeviceManager:
+    """Own the PyAudio output stream, keep it warm and reopen it when it fails.
+
+    The stream runs for the life of the manager and plays whatever the
+    callback returns, silence while idle, so playback never waits for the
+    device. A watchdog thread reopens it in the background when the callback
+    stalls, the stream stops or underflows pile up. ``on_failure`` is called
+    once the failed stream is closed, so the owner can resolve playbacks that
+    will never reach the callback.
+    """
+
+    def __init__(
+        self,
+        callback: StreamCallback,
+        channels: int,
+        rate: int,
+        frames_per_buffer: int,
+        on_failure: Callable[[], None] | None = None,
+    ) -> None:
+        self._callback = callback
+        self._channels = channels
+        self._rate = rate
+        self._frames_per_buffer = frames_per_buffer
+        self._on_failure = on_failure
+
+        self._player: pyaudio.PyAudio | None = None
+        self._stream: pyaudio.Stream | None = None
+        self._output_latency = 0.0
+        self._last_callback_at = monotonic()
+        self._underflow_times: deque[float] = deque()
+        self._underflow_lock = Lock()
+        self._reopen_reason: str | None = None
+        self._health = AudioDeviceHealth()
+        self._closed = Event()
+
+        try:
+            self._open()
+        except OSError as e:
+            # the watchdog keeps trying, a missing DAC must not stop the session
+            self._report_error(f"opening the audio device failed: {e}")
+            self._health.state = AudioDeviceStateEnum.RECOVERING
+
+        self._watchdog = Thread(target=self._watch, name="audio-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def _open(self) -> None:
+        self._player = pyaudio.PyAudio()
+        self._last_callback_at = monotonic()
+        self._stream = self._player.open(
+            format=pyaudio.paInt16,
+            channels=self._channels,
+            rate=self._rate,
+            output=True,
+            frames_per_buffer=self._frames_per_buffer,
+            stream_callback=self._stream_callback,
+        )
+        self._output_latency = self._stream.get_output_latency()
+        with self._underflow_lock:
+            self._underflow_times.clear()
+        self._reopen_reason = None
+
+    def _close_stream(self) -> None:
+        stream, self._stream = self._stream, None
+        player, self._player = self._player, None
+        try:
+            if stream is not None:
+                stream.stop_stream()
+                stream.close()
+            if player is not None:
+                # terminating re-enumerates devices, needed after a USB reconnect
+                player.terminate()
+        except OSError as e:
+            logger.debug(f"Closing the audio device failed: {e}")
+
+    def _stream_callback(self, in_data, frame_count, time_info, status):
+        now = monotonic()
+        self._last_callback_at = now
+        if status & pyaudio.paOutputUnderflow:
+            self._record_underflow(now)
+        return self._callback(in_data, frame_count, time_info, status)
+
+    def _record_underflow(self, now: float) -> None:
+        self._health.underflows += 1
+        with self._underflow_lock:
+            self._underflow_times.append(now)
+            while self._underflow_times[0] < now - UNDERFLOW_STORM_WINDOW:
+                self._underflow_times.popleft()
+            storm = len(self._underflow_times) >= UNDERFLOW_STORM_COUNT
+        if storm:
+            self._reopen_reason = "underflow storm"
+
+    def _watch(self) -> None:
+        while not self._closed.wait(WATCHDOG_INTERVAL):
+            reason = self._check()
+            if reason is not None:
+                self._recover(reason)
+
+    def _check(self) -> str | None:
+        """Return why the stream must be reopened, or None if it is usable."""
+        if self._stream is None:
+            return "stream not open"
+        if self._reopen_reason is not None:
+            return self._reopen_reason
+
+        try:
+            active = self._stream.is_active()
+        except OSError as e:
+            return f"stream query failed: {e}"
+        if not active:
+            return "stream stopped"
+        if monotonic() - self._last_callback_at > STALL_TIMEOUT:
+            return "callback stalled"
+
+        with self._underflow_lock:
+            last_underflow = (
+                self._underflow_times[-1] if self._underflow_times else None
+            )
+        recent = (
+            last_underflow is not None
+            and last_underflow >= monotonic() - UNDERFLOW_STORM_WINDOW
+        )
+        self._set_state(
+            AudioDeviceStateEnum.DEGRADED if recent else AudioDeviceStateEnum.HEALTHY
+        )
+        return None
+
+    def _recover(self, reason: str) -> None:
+        self._report_error(reason)
+        self._set_state(AudioDeviceStateEnum.RECOVERING)
+        self._close_stream()
+        if self._on_failure is not None:
+            self._on_failure()
+
+        attempt = 0
+        while not self._closed.is_set():
+            self._close_stream()
+            try:
+                self._open()
+            except OSError as e:
+                attempt += 1
+                delay = REOPEN_BACKOFF[min(attempt, len(REOPEN_BACKOFF)) - 1]
+                self._report_error(f"reopen attempt {attempt} failed: {e}")
+                if attempt >= FAILED_AFTER_ATTEMPTS:
+                    self._set_state(AudioDeviceStateEnum.FAILED)
+                self._closed.wait(delay)
+                continue
+
+            self._health.reopen_count += 1
+            logger.info(f"Audio device reopened after {reason}")
+            self._set_state(AudioDeviceStateEnum.HEALTHY)
+            return
+
+    def _report_error(self, error: str) -> None:
+        logger.error(f"Audio device: {error}")
+        self._health.last_error = error
+        self._health.last_error_at = time()
+
+    def _set_state(self, state: AudioDeviceStateEnum) -> None:
+        if self._health.state != state:
+            logger.info(f"Audio device {self._health.state} -> {state}")
+            self._health.state = state
+
+    @property
+    def health(self) -> AudioDeviceHealth:
+        return self._health.model_copy()
+
+    @property
+    def output_latency(self) -> float:
+        """Output latency of the current stream in seconds, from PortAudio."""
+        return self._output_latency
+
+    def playback_finished(
+        self, start_frame: int, end_frame: int, timing: AudioTiming
+    ) -> None:
+        pass
+
+    def close(self) -> None:
+        self._closed.set()
+        self._watchdog.join(timeout=WATCHDOG_INTERVAL * 2)
+        self._close_stream()
+
+
+class NullSinkDevice:
+    """Output device that renders the stream to files instead of a sound card.
+
+    A clock thread pulls buffers from the callback at the stream rate, or the
+    caller pulls them with ``pump`` when the config is not realtime. Every
+    finished playback is cut from the rendered stream and written as
+    ``<index>.wav`` and ``<index>.npy``, with a ``playbacks.jsonl`` line
+    holding its frames and timing.
+    """
+
+    def __init__(
+        self,
+        callback: StreamCallback,
+        channels: int,
+        rate: int,
+        frames_per_buffer: int,
+        config: NullSinkConfig,
+    ) -> None:
+        self._callback = callback
+        self._channels = channels
+        self._rate = rate
+        self._frames_per_buffer = frames_per_buffer
+        self._frame_bytes = SAMPLE_BYTES * channels
+
+        self._output_dir = config.output_dir / datetime.now().strftime(
+            "%Y%m%d_%H%M%S_%f"
+        )
+        self._output_dir.mkdir(parents=True, exist_ok=True)
+        self._index_path = self._output_dir / "playbacks.jsonl"
+
+        self._frame_index = 0
+        self._chunks: deque[tuple[int, bytes]] = deque()
+        self._finished: list[tuple[int, int, AudioTiming]] = []
+        self._lock = Lock()
+        self._closed = Event()
+        self.recordings: list[SinkRecording] = []
+
+        self._clock: Thread | None = None
+        if config.realtime:
+            self._clock = Thread(target=self._run, name="audio-null-sink", daemon=True)
+            self._clock.start()
+
+    def _run(self) -> None:
+        period = self._frames_per_buffer / self._rate
+        deadline = monotonic()
+        while not self._closed.is_set():
+            self.pump()
+            deadline += period
+            sleep(max(deadline - monotonic(), 0.0))
+
+    def pump(self, buffers: int = 1) -> None:
+        """Pull buffers from the callback and write the playbacks they finish."""
+        for _ in range(buffers):
+            with self._lock:
+                now = monotonic()
+                time_info = {"current_time": now, "output_buffer_dac_time": now}
+                data, _ = self._callback(None, self._frames_per_buffer, time_info, 0)
+                self._chunks.append((self._frame_index, bytes(data)))
+                self._frame_index += self._frames_per_buffer
+
+                history = int(SINK_HISTORY * self._rate)
+                while self._chunks[0][0] < self._frame_index - history:
+                    self._chunks.popleft()
+
+                finished, self._finished = self._finished, []
+                for start_frame, end_frame, timing in finished:
+                    self._write(start_frame, end_frame, timing)
+
+    def _write(self, start_frame: int, end_frame: int, timing: AudioTiming) -> None:
+        first_frame = self._chunks[0][0]
+        if start_frame < first_frame:
+            logger.warning(
+                f"Null sink lost frames {start_frame}-{first_frame} of a playback"
+            )
+            start_frame = first_frame
+
+        # chunks are one buffer each, so only the overlapping ones are joined
+        first = (start_frame - first_frame) // self._frames_per_buffer
+        last = (end_frame - first_frame - 1) // self._frames_per_buffer
+        chunk_frame = first_frame + first * self._frames_per_buffer
+        stream = b"".join(chunk for _, chunk in islice(self._chunks, first, last + 1))
+        data = stream[
+            (start_frame - chunk_frame) * self._frame_bytes : (end_frame - chunk_frame)
+            * self._frame_bytes
+        ]
+        samples = np.frombuffer(data, dtype=np.int16).reshape(-1, self._channels)
+
+        recording = SinkRecording(
+            index=len(self.recordings),
+            start_frame=start_frame,
+            end_frame=end_frame,
+            wav=self._output_dir / f"{len(self.recordings):05d}.wav",
+            npy=self._output_dir / f"{len(self.recordings):05d}.npy",
+            timing=timing,
+        )
+        with wave.open(str(recording.wav), "wb") as wav:
+            wav.setnchannels(self._channels)
+            wav.setsampwidth(SAMPLE_BYTES)
+            wav.setframerate(self._rate)
+            wav.writeframes(data)
+        np.save(recording.npy, samples)
+        with self._index_path.open("a") as f:
+            f.write(recording.model_dump_json() + "\n")
+        self.recordings.append(recording)
+
+    @property
+    def health(self) -> AudioDeviceHealth:
+        return AudioDeviceHealth()
+
+    @property
+    def output_latency(self) -> float:
+        return 0.0
+
+    def playback_finished(
+        self, start_frame: int, end_frame: int, timing: AudioTiming
+    ) -> None:
+        # runs inside pump, written once the buffer is appended
+        self._finished.append((start_frame, end_frame, timing))
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._clock is not None:
+            self._clock.join(timeout=1.0)
@@ -0,0 +1,30 @@
+from time import monotonic_ns, time
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ClockAnchor(BaseModel):
+    """The wall clock and the monotonic clock read at the same instant.
+
+    Timestamps are taken on the monotonic clock, which NTP cannot step, and
+    converted to wall-clock time through one anchor per session so that
+    detections, touches and audio onsets stay comparable.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    wall: float  # s since the epoch
+    monotonic_ns: int
+
+    @classmethod
+    def now(cls) -> "ClockAnchor":
+        return cls(wall=time(), monotonic_ns=monotonic_ns())
+
+    def to_wall(self, timestamp_ns: int) -> float:
+        return self.wall + (timestamp_ns - self.monotonic_ns) / 1e9
+
+    def to_monotonic_ns(self, wall: float) -> int:
+        return self.monotonic_ns + round((wall - self.wall) * 1e9)
+
+
+session_clock = ClockAnchor.now()
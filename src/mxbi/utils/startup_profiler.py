@@ -0,0 +1,182 @@
+import builtins
+import importlib
+import json
+import sys
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+
+# Keep this module free of heavy imports, it is enabled before anything else
+# is loaded so that those imports show up in the report.
+
+
+class StartupProfiler:
+    """Record wall time per first-time import and per named init phase.
+
+    Imports are timed by wrapping ``builtins.__import__`` and
+    ``importlib.import_module`` on the main thread; ``inclusive`` covers nested
+    imports and ``self`` excludes them, similar to ``python -X importtime``.
+    Time spent in ``excluded`` blocks, such as waiting for the operator, is left
+    out of the total. ``finish`` writes a JSON report once and exits with status
+    1 when it exceeds an optional budget file mapping phase or module names to
+    seconds.
+    """
+
+    def __init__(self) -> None:
+        self._enabled = False
+        self._finished = False
+        self._started_at = 0.0
+        self._excluded = 0.0
+        self._report_path: Path | None = None
+        self._budget_path: Path | None = None
+
+        self._phases: dict[str, float] = {}
+        self._imports: dict[str, tuple[float, float]] = {}
+        self._import_stack: list[float] = []
+        self._original_import = builtins.__import__
+        self._original_import_module = importlib.import_module
+        self._main_thread = threading.main_thread()
+
+        self.violations: list[str] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def enable(self, report_path: Path, budget_path: Path | None = None) -> None:
+        if self._enabled:
+            return
+
+        self._enabled = True
+        self._started_at = perf_counter()
+        self._report_path = report_path
+        self._budget_path = budget_path
+        builtins.__import__ = self._timed_import
+        importlib.import_module = self._timed_import_module
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if not self._enabled or self._finished:
+            yield
+            return
+
+        started_at = perf_counter()
+        try:
+            yield
+        finally:
+            self._phases[name] = perf_counter() - started_at
+
+    @contextmanager
+    def excluded(self) -> Iterator[None]:
+        """Leave the time spent in the block out of the total."""
+        if not self._enabled or self._finished:
+            yield
+            return
+
+        started_at = perf_counter()
+        try:
+            yield
+        finally:
+            self._excluded += perf_counter() - started_at
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or not self._should_time(name):
+            return self._original_import(name, globals, locals, fromlist, level)
+        return self._time_import(
+            name, self._original_import, name, globals, locals, fromlist, level
+        )
+
+    def _timed_import_module(self, name, package=None):
+        # modules that bound import_module while enabled keep calling this
+        if self._finished or name.startswith(".") or not self._should_time(name):
+            return self._original_import_module(name, package)
+        return self._time_import(name, self._original_import_module, name, package)
+
+    def _should_time(self, name: str) -> bool:
+        return (
+            name not in sys.modules and threading.current_thread() is self._main_thread
+        )
+
+    def _time_import(self, name: str, import_, *args):
+        self._import_stack.append(0.0)
+        started_at = perf_counter()
+        try:
+            return import_(*args)
+        finally:
+            inclusive = perf_counter() - started_at
+            nested = self._import_stack.pop()
+            if self._import_stack:
+                self._import_stack[-1] += inclusive
+            self._imports.setdefault(name, (inclusive, inclusive - nested))
+
+    def finish(self) -> None:
+        """Stop timing imports, write the report and evaluate the budget once."""
+        if not self._enabled or self._finished:
+            return
+
+        self._finished = True
+        total = perf_counter() - self._started_at - self._excluded
+        builtins.__import__ = self._original_import
+        importlib.import_module = self._original_import_module
+
+        report = self._build_report(total)
+        self.violations = self._check_budget(report)
+        report["passed"] = not self.violations
+        report["violations"] = self.violations
+
+        from mxbi.utils.logger import logger
+
+        assert self._report_path is not None
+        try:
+            self._report_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self._report_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            logger.info(f"Startup profile ({total:.3f} s) saved to {self._report_path}")
+        except OSError as e:
+            logger.error(f"Failed to write startup profile: {e}")
+
+        for violation in self.violations:
+            logger.error(f"Startup budget exceeded: {violation}")
+        if self.violations:
+            raise SystemExit(1)
+
+    def _build_report(self, total: float) -> dict:
+        imports = sorted(self._imports.items(), key=lambda item: -item[1][0])
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "total": total,
+            "phases": dict(self._phases),
+            "imports": [
+                {"module": name, "inclusive": inclusive, "self": own}
+                for name, (inclusive, own) in imports
+            ],
+        }
+
+    def _check_budget(self, report: dict) -> list[str]:
+        if self._budget_path is None:
+            return []
+
+        try:
+            budget: dict[str, float] = json.loads(
+                self._budget_path.read_text(encoding="utf-8")
+            )
+        except (OSError, ValueError) as e:
+            return [f"unreadable budget file {self._budget_path}: {e}"]
+
+        measured = {"total": report["total"], **report["phases"]}
+        measured.update(
+            (entry["module"], entry["inclusive"]) for entry in report["imports"]
+        )
+
+        violations = []
+        for name, limit in budget.items():
+            value = measured.get(name)
+            if value is not None and value > limit:
+                violations.append(f"{name} took {value:.3f} s, budget {limit:.3f} s")
+        return violations
+
+
+startup_profiler = StartupProfiler()
@@ -0,0 +1,244 @@
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from enum import StrEnum, auto
+from threading import Lock
+from typing import Annotated, Literal
+
+import numpy as np
+from numpy.typing import NDArray
+from pydantic import BaseModel, ConfigDict, Field
+
+DEFAULT_SAMPLE_RATE = 44100
+SYNTHESIS_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class ByteBudgetCache[K: Hashable, V]:
+    """Thread-safe LRU bounded by the total size of its values in bytes."""
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[V], int]) -> None:
+        self._max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._bytes = 0
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        size = self._sizeof(value)
+        if size > self._max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= self._sizeof(previous)
+
+            self._entries[key] = value
+            self._bytes += size
+            while self._bytes > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= self._sizeof(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+
+class FadeShapeEnum(StrEnum):
+    NONE = auto()
+    LINEAR = auto()
+    COSINE = auto()
+    EXPONENTIAL = auto()
+
+
+def _exponential_ramp(x: NDArray[np.float64]) -> NDArray[np.float64]:
+    # linear in dB over 60 dB, starting from true silence
+    ramp = 10 ** ((x - 1) * 3)
+    ramp[0] = 0.0
+    return ramp
+
+
+FADE_SHAPES: dict[
+    FadeShapeEnum, Callable[[NDArray[np.float64]], NDArray[np.float64]]
+] = {
+    FadeShapeEnum.LINEAR: lambda x: x,
+    FadeShapeEnum.COSINE: lambda x: 0.5 - 0.5 * np.cos(np.pi * x),
+    FadeShapeEnum.EXPONENTIAL: _exponential_ramp,
+}
+
+
+class FadeConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    shape: FadeShapeEnum = FadeShapeEnum.LINEAR
+    duration: float = 4.5  # ms, applied to both ends
+
+
+class BaseSynthConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    duration: int  # ms
+    sample_rate: int = DEFAULT_SAMPLE_RATE
+    level: float = Field(default=1.0, ge=0.0, le=1.0)  # peak, full scale is 1
+    fade: FadeConfig = FadeConfig()
+
+
+class ToneComplexConfig(BaseSynthConfig):
+    kind: Literal["tone_complex"] = "tone_complex"
+    frequencies: tuple[float, ...]
+    amplitudes: tuple[float, ...] | None = None  # relative, equal by default
+    phases: tuple[float, ...] | None = None  # rad
+
+
+class NoiseConfig(BaseSynthConfig):
+    kind: Literal["noise"] = "noise"
+    low: float = 0.0  # Hz
+    high: float | None = None  # Hz, Nyquist by default
+    seed: int = 0
+
+
+class AMToneConfig(BaseSynthConfig):
+    kind: Literal["am_tone"] = "am_tone"
+    carrier: float
+    modulation_frequency: float
+    depth: float = Field(default=1.0, ge=0.0, le=1.0)
+
+
+class FMToneConfig(BaseSynthConfig):
+    kind: Literal["fm_tone"] = "fm_tone"
+    carrier: float
+    modulation_frequency: float = Field(gt=0)  # Hz, divides the deviation
+    deviation: float  # Hz
+
+
+class SweepConfig(BaseSynthConfig):
+    kind: Literal["sweep"] = "sweep"
+    start_frequency: float
+    end_frequency: float
+    logarithmic: bool = True
+
+
+SynthConfig = Annotated[
+    ToneComplexConfig | NoiseConfig | AMToneConfig | FMToneConfig | SweepConfig,
+    Field(discriminator="kind"),
+]
+
+
+def _time_axis(config: BaseSynthConfig) -> NDArray[np.float64]:
+    samples = int(config.sample_rate * (config.duration / 1000))
+    return np.arange(max(samples, 0)) / config.sample_rate
+
+
+def _tone_complex(config: ToneComplexConfig, t: NDArray[np.float64]):
+    frequencies = np.asarray(config.frequencies, dtype=np.float64)
+    amplitudes = np.asarray(
+        config.amplitudes or (1.0,) * len(frequencies), dtype=np.float64
+    )
+    phases = np.asarray(config.phases or (0.0,) * len(frequencies), dtype=np.float64)
+    if not len(frequencies) == len(amplitudes) == len(phases):
+        raise ValueError("frequencies, amplitudes and phases must have equal length")
+
+    # (components, samples) phase matrix collapsed by the amplitude vector
+    waves = np.sin(2 * np.pi * frequencies[:, None] * t + phases[:, None])
+    return amplitudes @ waves / max(np.abs(amplitudes).sum(), 1e-12)
+
+
+def _noise(config: NoiseConfig, t: NDArray[np.float64]):
+    rng = np.random.default_rng(config.seed)
+    spectrum = np.fft.rfft(rng.standard_normal(len(t)))
+    bins = np.fft.rfftfreq(len(t), 1 / config.sample_rate)
+
+    high = config.high if config.high is not None else config.sample_rate / 2
+    spectrum[(bins < config.low) | (bins > high)] = 0
+    noise = np.fft.irfft(spectrum, len(t))
+
+    peak = np.abs(noise).max(initial=0.0)
+    return noise / peak if peak > 0 else noise
+
+
+def _am_tone(config: AMToneConfig, t: NDArray[np.float64]):
+    modulator = 1 + config.depth * np.sin(2 * np.pi * config.modulation_frequency * t)
+    return modulator / (1 + config.depth) * np.sin(2 * np.pi * config.carrier * t)
+
+
+def _fm_tone(config: FMToneConfig, t: NDArray[np.float64]):
+    index = config.deviation / config.modulation_frequency
+    return np.sin(
+        2 * np.pi * config.carrier * t
+        + index * np.sin(2 * np.pi * config.modulation_frequency * t)
+    )
+
+
+def _sweep(config: SweepConfig, t: NDArray[np.float64]):
+    f0, f1 = config.start_frequency, config.end_frequency
+    span = max(config.duration / 1000, 1e-12)
+    if config.logarithmic and f0 > 0 and f1 > 0 and f0 != f1:
+        rate = np.log(f1 / f0) / span
+        phase = 2 * np.pi * f0 * np.expm1(rate * t) / rate
+    else:
+        phase = 2 * np.pi * (f0 * t + (f1 - f0) / (2 * span) * t**2)
+    return np.sin(phase)
+
+
+_GENERATORS: dict[type[BaseSynthConfig], Callable] = {
+    ToneComplexConfig: _tone_complex,
+    NoiseConfig: _noise,
+    AMToneConfig: _am_tone,
+    FMToneConfig: _fm_tone,
+    SweepConfig: _sweep,
+}
+
+
+def _apply_fade(wave: NDArray[np.float64], fade: FadeConfig, sample_rate: int) -> None:
+    if fade.shape is FadeShapeEnum.NONE:
+        return
+
+    fade_samples = min(int(fade.duration * sample_rate / 1000), len(wave) // 2)
+    if fade_samples <= 0:
+        return
+
+    ramp = FADE_SHAPES[fade.shape](np.linspace(0, 1, fade_samples))
+    wave[:fade_samples] *= ramp
+    wave[-fade_samples:] *= ramp[::-1]
+
+
+def _render(config: BaseSynthConfig) -> NDArray[np.int16]:
+    t = _time_axis(config)
+    if not len(t):
+        return np.zeros(0, dtype=np.int16)
+
+    wave = _GENERATORS[type(config)](config, t)
+    _apply_fade(wave, config.fade, config.sample_rate)
+
+    max_val = np.iinfo(np.int16).max
+    return (wave * (config.level * max_val)).astype(np.int16)
+
+
+_cache: ByteBudgetCache[BaseSynthConfig, NDArray[np.int16]] = ByteBudgetCache(
+    SYNTHESIS_CACHE_BYTES, lambda samples: samples.nbytes
+)
+
+
+def synthesize(config: BaseSynthConfig) -> NDArray[np.int16]:
+    """Render a config to mono int16 samples, shared read-only from the cache."""
+    samples = _cache.get(config)
+    if samples is None:
+        samples = _render(config)
+        samples.flags.writeable = False
+        _cache.put(config, samples)
+    return samples
+
+
+def clear_synthesis_cache() -> None:
+    _cache.clear()